@@ -1,13 +1,22 @@
 import random
 import threading
 import time
+import tkinter as tk
+from concurrent.futures import Future
 from typing import Callable
 import multiprocessing
 
+from mazemastery.cache import MazeCache
+from mazemastery.grid import GridMaze, are_connected
+from mazemastery.headless import MoveLimitExceeded, NullRenderer, PlayerDied, RunResult, StopRun
+from mazemastery.infinite import HashedMaze
+from mazemastery.levelpack import LevelPack
 from mazemastery.maze import maze_factory
-from mazemastery.renderer import Renderer
+from mazemastery.mazefile import load_maze
+from mazemastery.rng import child_rng
+from mazemastery.renderer import Renderer, ViewportRenderer
 from mazemastery.state import State
-from mazemastery.types import Coord
+from mazemastery.types import Coord, PlayableMaze
 
 
 def get_pos() -> Coord:
@@ -23,13 +32,17 @@ def minotaur() -> Coord:
 def set_pos(new_pos: Coord) -> None:
     state = State()
     if state.dead:
+        if isinstance(state.renderer, NullRenderer):
+            raise PlayerDied("The player is dead")
         return
-    if new_pos not in state.maze[state.pos]:
-        print(f"Invalid move: {new_pos} is not a neighbor of {state.pos}")
+    if state.max_moves is not None and state.moves >= state.max_moves:
+        raise MoveLimitExceeded(f"Exceeded the limit of {state.max_moves} moves")
+    state.moves += 1
+    if not are_connected(state.maze, state.pos, new_pos):
+        state.renderer.log(f"Invalid move: {new_pos} is not a neighbor of {state.pos}")
         # We don't subtract a life on level 1
-        print(f"{state.level} state.level")
         if state.level != 1:
-            print("You lose a life!")
+            state.renderer.log("You lose a life!")
             state.lives -= 1
         new_pos = state.pos
     old_pos = state.pos
@@ -38,31 +51,36 @@ def set_pos(new_pos: Coord) -> None:
     # thread, since we don't strictly need to terminate the solution for it
     # to be valid (since the minotaur is at the end of the corridor).
     if state.level == 1 and new_pos == state.minotaur_coords:
+        state.found = True
         state.renderer.draw_popup("You found the minotaur!\nContinue to the next level ...")
     state.pos = new_pos
+    if new_pos == state.minotaur_coords and state.moves_to_minotaur is None:
+        state.moves_to_minotaur = state.moves
     if state.lives == 0:
         state.renderer.draw_popup("You died!")
         state.dead = True
     state.renderer.update_draw(old_pos, state.pos, state.lives)
-    time.sleep(state.renderer.delay / 1000)
-    while state.renderer.debug:
+    if state.renderer.delay:
         time.sleep(state.renderer.delay / 1000)
+    if state.controller.paused:
+        # The move was a step in debug mode, keep the view around the player.
+        state.renderer.draw_cloud(state.pos)
+        state.renderer.debug_menu.update_menu()
+    state.controller.wait()
 
 
 def put_blue_gem() -> None:
     state = State()
     pos = state.pos
-    if pos not in state.blue_gem_coords:
+    if state.blue_gem_coords.add(pos):
         state.renderer.push_blue_gem_buffer(pos)
-        state.blue_gem_coords.append(pos)
 
 
 def put_red_gem() -> None:
     state = State()
     pos = state.pos
-    if pos not in state.red_gem_coords:
+    if state.red_gem_coords.add(pos):
         state.renderer.push_red_gem_buffer(pos)
-        state.red_gem_coords.append(pos)
 
 
 def has_blue_gem(cell: Coord) -> bool:
@@ -75,6 +93,28 @@ def has_red_gem(cell: Coord) -> bool:
     return cell in state.red_gem_coords
 
 
+def count_blue_gems() -> int:
+    state = State()
+    return len(state.blue_gem_coords)
+
+
+def count_red_gems() -> int:
+    state = State()
+    return len(state.red_gem_coords)
+
+
+def clear_blue_gems() -> None:
+    state = State()
+    state.blue_gem_coords.clear()
+    state.renderer.clear_gems("blue")
+
+
+def clear_red_gems() -> None:
+    state = State()
+    state.red_gem_coords.clear()
+    state.renderer.clear_gems("red")
+
+
 def has_minotaur() -> bool:
     state = State()
     return state.pos == state.minotaur_coords
@@ -82,12 +122,12 @@ def has_minotaur() -> bool:
 
 def is_neighbor(pos: Coord, neighbor: Coord) -> bool:
     state = State()
-    return neighbor in state.maze[pos]
+    return are_connected(state.maze, pos, neighbor)
 
 
 def are_neighbors(pos1: Coord, pos2: Coord) -> bool:
     state = State()
-    return pos2 in state.maze[pos1]
+    return are_connected(state.maze, pos1, pos2)
 
 
 def get_neighbors() -> list[Coord]:
@@ -96,48 +136,202 @@ def get_neighbors() -> list[Coord]:
     return state.maze[pos]
 
 
+def changing_maze() -> GridMaze:
+    """
+    Returns the maze of the current game for changing its walls. Only grid
+    mazes can change, i.e., those of levels 5-8 and loaded ones; the
+    corridors of levels 1-4 are plain dicts.
+    """
+    state = State()
+    if not isinstance(state.maze, GridMaze):
+        raise TypeError(f"Walls of level {state.level} cannot change")
+    return state.maze
+
+
+def open_wall(cell: Coord, neighbor: Coord) -> None:
+    """
+    Removes the wall between two adjacent cells during the game. The window
+    shows the change right away, and distance fields kept with the maze
+    follow it (see `GridMaze.open_wall`).
+    """
+    changing_maze().open_wall(cell, neighbor)
+
+
+def close_wall(cell: Coord, neighbor: Coord) -> None:
+    """Puts up the wall between two adjacent cells during the game."""
+    changing_maze().close_wall(cell, neighbor)
+
+
 def run(
-    level: int,
+    level: int | None,
     solve: Callable[[], None],
     rows: int = 10,
     cols: int = 10,
     cell_size: int = 50,
     delay: int = 1000,
     seed: int | None = None,
-) -> None:
+    engine: str = "dfs",
+    maze_file: str | None = None,
+    cache: MazeCache | None = None,
+    pack: str | LevelPack | None = None,
+    unbounded: bool = False,
+    headless: bool = False,
+    max_moves: int | None = None,
+) -> RunResult | None:
+    """
+    Creates the maze of the given level and runs `solve` on it.
+
+    With `headless`, nothing is drawn: `solve` runs to completion on the
+    calling thread without any delay and a `RunResult` is returned. A
+    headless run is stopped after `max_moves` moves, if given. Otherwise,
+    the `RunResult` is returned once the window is closed, or None if the
+    solution has not returned by then.
+    """
+    # An unbounded maze has no size, rows and cols are the size of the
+    # visible window. The minotaur hides outside of the first window.
+    if unbounded:
+        maze = HashedMaze(seed if seed is not None else random.getrandbits(32))
+        minotaur_coords = maze.minotaur_coords(rows, cols)
+        level = level if level is not None else 0
+    # A maze file replaces level, rows and cols. The cells are copied, such
+    # that the file is closed before the solution runs.
+    elif maze_file is not None:
+        with load_maze(maze_file) as loaded:
+            maze, minotaur_coords = loaded.maze.copy(), loaded.minotaur_coords
+            level = loaded.level
+            seed = seed if seed is not None else loaded.seed
+    elif level is None:
+        raise ValueError("Either a level or a maze file is required")
+    elif pack is not None:
+        # A level pack replaces rows and cols, and the seed if none is given.
+        # As for maze files, the maze is copied, and packs given by path are
+        # closed right away.
+        if isinstance(pack, LevelPack):
+            loaded = pack.get(level, seed, copy=True)
+        else:
+            with LevelPack(pack) as opened:
+                loaded = opened.get(level, seed, copy=True)
+        maze, minotaur_coords = loaded.maze, loaded.minotaur_coords
+        seed = loaded.seed
+    elif cache is not None:
+        maze, minotaur_coords = cache.get(level, rows, cols, seed, engine)
+    else:
+        maze_rng = child_rng(seed, "maze")
+        maze, minotaur_coords = maze_factory(level, rows, cols, engine, maze_rng)
+
+    # The maze and the decorations draw from their own streams, so only the
+    # solution sees the random module.
     random.seed(seed)
-    maze, minotaur_coords = maze_factory(level, rows, cols)
-    renderer = Renderer(
-        maze,
-        minotaur_coords,
-        cell_size=cell_size,
-        delay=delay
-    )
+    if headless:
+        return run_headless(maze, minotaur_coords, level, solve, max_moves)
+    State.reset()
+    if isinstance(maze, HashedMaze):
+        renderer: Renderer = ViewportRenderer(
+            maze,
+            minotaur_coords,
+            rows,
+            cols,
+            cell_size=cell_size,
+            delay=delay,
+            rng=child_rng(seed, "decorations"),
+        )
+    else:
+        renderer = Renderer(
+            maze,
+            minotaur_coords,
+            cell_size=cell_size,
+            delay=delay,
+            rng=child_rng(seed, "decorations"),
+        )
     State(
         maze=maze,
         renderer=renderer,
         minotaur_coords=minotaur_coords,
+        stack=[],
         level=level,
     )
     renderer.initial_draw()
-    solution_thread = threading.Thread(target=solve, name="solution_thread")
+    finished: Future[RunResult] = Future()
+
+    # Runs the solution and hands its result to the Tk event loop as soon as
+    # it returns, where we check if the player has found the minotaur.
+    def run_solution() -> None:
+        start = time.perf_counter()
+        try:
+            solve()
+        finally:
+            finished.set_result(collect_result(State(), time.perf_counter() - start))
+            try:
+                renderer.root.event_generate("<<SolutionFinished>>", when="tail")
+            except (tk.TclError, RuntimeError):
+                # The window was closed before the solution returned.
+                pass
+
+    def on_solution_finished(event: object) -> None:
+        state = State()
+        if state.pos == state.minotaur_coords:
+            renderer.draw_popup("You found the minotaur!\nContinue to the next level ...")
+
+    renderer.root.bind("<<SolutionFinished>>", on_solution_finished)
+    solution_thread = threading.Thread(target=run_solution, name="solution_thread")
     solution_thread.start()
+    try:
+        renderer.root.mainloop()
+    finally:
+        renderer.close()
+    return finished.result() if finished.done() else None
+
 
-    # This function runs on a seperate thread and repeatedly checks if the
-    # the solution thread is dead. If so, we check if the player has found the
-    # minotaur.
-    def check_if_found_minotaur():
-        while True:
-            time.sleep(0.1)
-            if solution_thread.is_alive():
-                continue
-            state = State()
-            if state.pos == state.minotaur_coords:
-                renderer.draw_popup("You found the minotaur!\nContinue to the next level ...")
-            break
-    check_solution_thread = threading.Thread(
-        target=check_if_found_minotaur,
-        name="check_if_found_minotaur_thread"
+def collect_result(
+    state: State,
+    seconds: float,
+    stopped: bool = False,
+    popups: list[str] | None = None,
+    messages: list[str] | None = None,
+) -> RunResult:
+    """Summarizes the game in `state` once the solution returned."""
+    return RunResult(
+        found=state.found or (not state.dead and state.pos == state.minotaur_coords),
+        dead=state.dead,
+        moves=state.moves,
+        moves_to_minotaur=state.moves_to_minotaur,
+        lives=state.lives,
+        pos=state.pos,
+        seconds=seconds,
+        stopped=stopped,
+        popups=popups if popups is not None else [],
+        messages=messages if messages is not None else [],
+    )
+
+
+def run_headless(
+    maze: PlayableMaze,
+    minotaur_coords: Coord,
+    level: int,
+    solve: Callable[[], None],
+    max_moves: int | None = None,
+) -> RunResult:
+    """
+    Runs `solve` on `maze` without drawing anything. Exceptions raised by
+    `solve` are propagated, except for `StopRun`.
+    """
+    State.reset()
+    renderer = NullRenderer(maze, minotaur_coords)
+    state = State(
+        maze=maze,
+        renderer=renderer,
+        minotaur_coords=minotaur_coords,
+        stack=[],
+        level=level,
+        max_moves=max_moves,
     )
-    check_solution_thread.start()
-    renderer.root.mainloop()
+    stopped = False
+    start = time.perf_counter()
+    try:
+        solve()
+    except MoveLimitExceeded:
+        stopped = True
+    except StopRun:
+        pass
+    seconds = time.perf_counter() - start
+    return collect_result(state, seconds, stopped, renderer.popups, renderer.messages)
@@ -0,0 +1,78 @@
+"""
+Parallel generation of many mazes, e.g., to build a test corpus.
+"""
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
+from mazemastery.grid import GridMaze, as_grid
+from mazemastery.maze import maze_factory
+from mazemastery.rng import child_rng
+from mazemastery.types import Coord
+
+# Seed, rows and cols of a single maze.
+Job = tuple[int, int, int]
+
+
+@dataclass
+class BatchItem:
+    seed: int
+    rows: int
+    cols: int
+    maze: GridMaze
+    minotaur_coords: Coord
+
+
+def generate_chunk(level: int, engine: str, jobs: list[Job]) -> list[BatchItem]:
+    """
+    Generates the mazes of a chunk of jobs. Every maze is generated from its
+    own seed, so the result does not depend on which process runs the job or
+    on what it generated before.
+    """
+    items = []
+    for seed, rows, cols in jobs:
+        rng = child_rng(seed, "maze")
+        maze, minotaur_coords = maze_factory(level, rows, cols, engine, rng)
+        items.append(BatchItem(seed, rows, cols, as_grid(maze), minotaur_coords))
+    return items
+
+
+def generate_batch(
+    level: int,
+    sizes: Iterable[tuple[int, int]],
+    seeds: Iterable[int],
+    workers: int | None = None,
+    engine: str = "dfs",
+    chunksize: int = 16,
+) -> Iterator[BatchItem]:
+    """
+    Generates a maze of `level` for every seed and every (rows, cols) in
+    `sizes`, spread over `workers` processes (all cores if None, no pool if
+    1). Mazes are yielded in the order of the seeds, and for each seed in the
+    order of the sizes. The output is the same for any number of workers.
+
+    Jobs are submitted in chunks of `chunksize`, and at most two chunks per
+    worker are in flight, so memory stays bounded even if `seeds` is a long
+    or infinite iterator.
+    """
+    sizes = list(sizes)
+    jobs = ((seed, rows, cols) for seed in seeds for rows, cols in sizes)
+    chunks = iter(lambda: list(islice(jobs, chunksize)), [])
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield from generate_chunk(level, engine, chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        max_pending = 2 * workers
+        pending: deque[Future[list[BatchItem]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(generate_chunk, level, engine, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,495 @@
+"""
+Benchmark suite for maze generation and solving.
+
+`run` times `maze_factory` for every level and the reference solvers over
+a ladder of maze sizes and writes the results to a JSON file. More suites
+can be selected with `--suites` (see `SUITES`): the generator engines, the
+grid against the dict representation, the scaling of the self-avoiding
+walk, the corpus statistics and the streamed generation. `compare` checks
+a new result file against a saved baseline and lists the cases that got
+slower or use more memory than the threshold allows.
+
+Usage:
+    python -m mazemastery.bench run results.json [--sizes 10 100 ...] [--suites levels saw ...]
+    python -m mazemastery.bench compare baseline.json results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
+
+from mazemastery.grid import GridMaze, are_connected
+from mazemastery.maze import ENGINES, GENERATOR_VERSION, create_maze, create_SAW, maze_factory
+from mazemastery.rng import child_rng
+from mazemastery.solvers import SOLVERS
+from mazemastery.stream import FileSink, RowChecker, eller_rows, stream_to
+from mazemastery.types import Maze
+
+FORMAT_VERSION = 2
+SIZES = (10, 30, 100, 300, 1000, 2000)
+LEVELS = range(1, 9)
+SUITES = ("levels", "solvers", "engines", "grid", "saw", "stats", "stream")
+DEFAULT_SUITES = ("levels", "solvers")
+
+# Temperature of level 5 and one that makes the walk sweep the grid, such
+# that its length grows with the number of cells.
+SAW_TEMPS = (0.01, -2.0)
+
+# Number of neighbor lookups per case of the "grid" suite.
+LOOKUPS = 100_000
+
+# Cells of the corpus of the "stats" suite, spread over mazes of each size.
+STATS_CELLS = 10**6
+
+# Metrics checked by `compare`. Times below MIN_SECONDS are dominated by
+# noise, and so are small numbers of blocks (e.g., from caches filled on
+# first use). They are never reported as regressions.
+METRICS = ("seconds", "peak_bytes", "live_blocks")
+MIN_SECONDS = 0.005
+MIN_LIVE_BLOCKS = 100
+
+
+@dataclass
+class BenchResult:
+    # "level<k>" for `maze_factory`, "solve/<solver>" for the solvers, and
+    # "<suite>/<name>" for the other suites.
+    case: str
+    size: int
+    # Number of cells the per-cell figures refer to. Cases that do not scale
+    # with the maze count their operations instead, e.g., the steps of the
+    # walk for "saw/<temp>" and the lookups for "lookup/<repr>".
+    cells: int
+    # Fastest of the timed runs, without tracing.
+    seconds: float
+    # Peak of the memory traced during a separate run.
+    peak_bytes: int
+    # Memory blocks allocated during that run and still alive at its end,
+    # i.e., the allocations making up the result. This is not the number of
+    # allocations: temporaries freed before the end are not counted, since
+    # tracemalloc only sees the blocks alive at a snapshot.
+    live_blocks: int
+
+    @property
+    def key(self) -> tuple[str, int]:
+        return self.case, self.size
+
+    @property
+    def seconds_per_cell(self) -> float:
+        return self.seconds / self.cells
+
+    @property
+    def live_blocks_per_cell(self) -> float:
+        return self.live_blocks / self.cells
+
+    @property
+    def bytes_per_cell(self) -> float:
+        return self.peak_bytes / self.cells
+
+
+@dataclass
+class Regression:
+    case: str
+    size: int
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.case} at {self.size}: {self.metric} "
+            f"{self.baseline:.4g} -> {self.current:.4g} ({self.ratio - 1:+.0%})"
+        )
+
+
+def measure(
+    case: str,
+    size: int,
+    func: Callable[[], object],
+    repeat: int = 3,
+    cells: int | None = None,
+) -> BenchResult:
+    """
+    Times `func` and traces the memory of one more call. As in
+    `maze.profile_engine`, tracing runs separately since it slows down the
+    allocations considerably. `func` must be deterministic, e.g., by
+    creating its own seeded random generator. The number of `cells` is
+    taken from the maze returned by `func` if omitted.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        live_blocks = sum(stat.count_diff for stat in after.compare_to(before, "traceback"))
+    finally:
+        tracemalloc.stop()
+    if cells is None:
+        maze, _ = result  # type: ignore
+        cells = len(maze)
+    return BenchResult(case, size, cells, seconds, peak, live_blocks)
+
+
+def bench_levels(
+    sizes: Iterable[int],
+    levels: Iterable[int] = LEVELS,
+    engine: str = "dfs",
+    repeat: int = 3,
+    seed: int = 0,
+) -> Iterator[BenchResult]:
+    """
+    Benchmarks `maze_factory` on `size` x `size` mazes. Levels 1-4 only use
+    the number of columns.
+    """
+    levels = list(levels)
+    for size in sizes:
+        for level in levels:
+            yield measure(
+                f"level{level}",
+                size,
+                lambda: maze_factory(level, size, size, engine, random.Random(seed)),
+                repeat,
+            )
+
+
+def bench_solvers(
+    sizes: Iterable[int],
+    solvers: Iterable[str] = tuple(SOLVERS),
+    engine: str = "dfs",
+    repeat: int = 3,
+    seed: int = 0,
+) -> Iterator[BenchResult]:
+    """
+    Benchmarks the reference solvers from corner to corner of a level 7
+    maze of size `size` x `size`. The measured cells are the ones of the
+    maze, not the expanded ones.
+    """
+    solvers = list(solvers)
+    for size in sizes:
+        maze, _ = maze_factory(7, size, size, engine, random.Random(seed))
+        goal = (size - 1, size - 1)
+        for name in solvers:
+            solver = SOLVERS[name]
+            yield measure(
+                f"solve/{name}",
+                size,
+                lambda: solver(maze, (0, 0), goal),
+                repeat,
+                len(maze),
+            )
+
+
+def bench_engines(
+    sizes: Iterable[int],
+    engines: Iterable[str] = tuple(ENGINES),
+    repeat: int = 3,
+    seed: int = 0,
+) -> Iterator[BenchResult]:
+    """
+    Benchmarks `create_maze` with each engine (see `maze.ENGINES`) on
+    `size` x `size` mazes with the loops of level 7.
+    """
+    engines = list(engines)
+    for size in sizes:
+        for engine in engines:
+            yield measure(
+                f"engine/{engine}",
+                size,
+                lambda: create_maze(size, size, (0, 0), 0.2, engine, random.Random(seed)),
+                repeat,
+                size * size,
+            )
+
+
+def binary_tree_walls(rows: int, cols: int, seed: int) -> list[int]:
+    """
+    For each cell, 0 to carve north, 1 to carve west, -1 for the origin.
+    Both representations of the "grid" suite are built from these choices.
+    """
+    rng = random.Random(seed)
+    choices = []
+    for i in range(rows):
+        for j in range(cols):
+            if i == 0 and j == 0:
+                choices.append(-1)
+            elif i == 0:
+                choices.append(1)
+            elif j == 0:
+                choices.append(0)
+            else:
+                choices.append(rng.randrange(2))
+    return choices
+
+
+def build_dict(rows: int, cols: int, choices: list[int]) -> Maze:
+    maze: Maze = {(i, j): [] for i in range(rows) for j in range(cols)}
+    for k, c in enumerate(choices):
+        if c < 0:
+            continue
+        i, j = divmod(k, cols)
+        other = (i - 1, j) if c == 0 else (i, j - 1)
+        maze[(i, j)].append(other)
+        maze[other].append((i, j))
+    return maze
+
+
+def build_grid(rows: int, cols: int, choices: list[int]) -> GridMaze:
+    maze = GridMaze(rows, cols)
+    for k, c in enumerate(choices):
+        if c < 0:
+            continue
+        i, j = divmod(k, cols)
+        maze.open_wall((i, j), (i - 1, j) if c == 0 else (i, j - 1))
+    return maze
+
+
+def bench_grid(
+    sizes: Iterable[int],
+    repeat: int = 3,
+    seed: int = 0,
+    lookups: int = LOOKUPS,
+) -> Iterator[BenchResult]:
+    """
+    Compares the dict-based representation with `GridMaze` on the same
+    `size` x `size` maze: building it from its walls ("build/<repr>") and
+    `are_connected` on `lookups` random pairs of adjacent cells
+    ("lookup/<repr>").
+    """
+    for size in sizes:
+        choices = binary_tree_walls(size, size, seed)
+        rng = random.Random(seed)
+        queries = []
+        for _ in range(lookups):
+            i, j = rng.randrange(size), rng.randrange(size)
+            di, dj = rng.choice([(-1, 0), (0, -1), (0, 1), (1, 0)])
+            queries.append(((i, j), (i + di, j + dj)))
+        for name, build in (("dict", build_dict), ("grid", build_grid)):
+            yield measure(
+                f"build/{name}", size, lambda: build(size, size, choices), repeat, size * size
+            )
+            maze = build(size, size, choices)
+
+            def lookup() -> None:
+                for c0, c1 in queries:
+                    are_connected(maze, c0, c1)
+
+            yield measure(f"lookup/{name}", size, lookup, repeat, lookups)
+            del maze
+
+
+def bench_saw(
+    sizes: Iterable[int],
+    temps: Iterable[float] = SAW_TEMPS,
+    repeat: int = 3,
+    seed: int = 0,
+) -> Iterator[BenchResult]:
+    """
+    Benchmarks `create_SAW` on `size` x `size` grids. The per-cell figures
+    are per step of the walk, which stay constant if a step is O(1).
+    """
+    temps = list(temps)
+    for size in sizes:
+        for temp in temps:
+            _, path = create_SAW(size, size, temp, random.Random(seed))
+            yield measure(
+                f"saw/{temp:g}",
+                size,
+                lambda: create_SAW(size, size, temp, random.Random(seed)),
+                repeat,
+                len(path),
+            )
+
+
+def bench_stats(
+    sizes: Iterable[int],
+    repeat: int = 3,
+    seed: int = 0,
+    cells: int = STATS_CELLS,
+) -> Iterator[BenchResult]:
+    """
+    Benchmarks `maze_stats.corpus_stats` on a corpus of level 7 mazes of
+    `size` x `size` with about `cells` cells in total. Generating the corpus
+    is not measured. Requires NumPy.
+    """
+    from mazemastery.maze_stats import corpus_stats
+
+    for size in sizes:
+        count = max(1, cells // (size * size))
+        corpus = [
+            maze_factory(7, size, size, "dfs", child_rng(seed + k, "maze"))
+            for k in range(count)
+        ]
+        yield measure(
+            "stats/corpus", size, lambda: corpus_stats(corpus), repeat, count * size * size
+        )
+
+
+def bench_stream(sizes: Iterable[int], repeat: int = 3, seed: int = 0) -> Iterator[BenchResult]:
+    """
+    Benchmarks streaming a `size` x `size` maze from `stream.eller_rows`
+    through a `RowChecker` into a file. The peak memory only grows with the
+    number of columns.
+    """
+    for size in sizes:
+
+        def stream() -> RowChecker:
+            checker = RowChecker(size)
+            with open(os.devnull, "wb") as file:
+                stream_to(eller_rows(size, size, rng=random.Random(seed)), FileSink(file), checker)
+            if not checker.finish():
+                raise RuntimeError(f"Invalid streamed maze: {checker.errors[0]}")
+            return checker
+
+        yield measure("stream/eller", size, stream, repeat, size * size)
+
+
+def save_results(path: str | os.PathLike, results: list[BenchResult], engine: str) -> None:
+    data = {
+        "version": FORMAT_VERSION,
+        "generator_version": GENERATOR_VERSION,
+        "engine": engine,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def load_results(path: str | os.PathLike) -> list[BenchResult]:
+    with open(path) as file:
+        data = json.load(file)
+    version = data.get("version", 0)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark file version: {version}")
+    results = data["results"]
+    if version < 2:
+        # Version 1 called the live blocks "blocks".
+        results = [
+            {("live_blocks" if k == "blocks" else k): v for k, v in result.items()}
+            for result in results
+        ]
+    return [BenchResult(**result) for result in results]
+
+
+def compare(
+    baseline: Iterable[BenchResult],
+    current: Iterable[BenchResult],
+    threshold: float = 0.2,
+) -> list[Regression]:
+    """
+    Lists the metrics of the cases in both `baseline` and `current` that
+    grew by more than `threshold` (relative to the baseline).
+    """
+    old = {result.key: result for result in baseline}
+    regressions = []
+    for new in current:
+        base = old.get(new.key)
+        if base is None:
+            continue
+        for metric in METRICS:
+            before, after = getattr(base, metric), getattr(new, metric)
+            if metric == "seconds" and after < MIN_SECONDS:
+                continue
+            if metric == "live_blocks" and after < MIN_LIVE_BLOCKS:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append(Regression(new.case, new.size, metric, before, after))
+    return regressions
+
+
+def print_result(result: BenchResult) -> None:
+    print(
+        f"{result.case:>22} {result.size:>5} {result.seconds:>9.4f}s "
+        f"{result.seconds_per_cell * 1e6:>9.3f} "
+        f"{result.peak_bytes / 2**20:>8.1f}MB {result.live_blocks_per_cell:>10.2f}",
+        flush=True,
+    )
+
+
+def run_suites(
+    suites: Iterable[str],
+    sizes: list[int],
+    levels: list[int],
+    solvers: list[str],
+    engine: str = "dfs",
+    repeat: int = 3,
+    seed: int = 0,
+) -> Iterator[BenchResult]:
+    """Runs the selected `suites` (see `SUITES`) in the order of `SUITES`."""
+    suites = set(suites)
+    if "levels" in suites:
+        yield from bench_levels(sizes, levels, engine, repeat, seed)
+    if "solvers" in suites:
+        yield from bench_solvers(sizes, solvers, engine, repeat, seed)
+    if "engines" in suites:
+        yield from bench_engines(sizes, repeat=repeat, seed=seed)
+    if "grid" in suites:
+        yield from bench_grid(sizes, repeat, seed)
+    if "saw" in suites:
+        yield from bench_saw(sizes, repeat=repeat, seed=seed)
+    if "stats" in suites:
+        yield from bench_stats(sizes, repeat, seed)
+    if "stream" in suites:
+        yield from bench_stream(sizes, repeat, seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks maze generation and solving.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Runs the benchmarks and saves the results.")
+    run.add_argument("path")
+    run.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    run.add_argument("--levels", type=int, nargs="+", default=list(LEVELS))
+    run.add_argument("--solvers", nargs="*", default=list(SOLVERS))
+    run.add_argument("--suites", nargs="+", choices=SUITES, default=list(DEFAULT_SUITES))
+    run.add_argument("--engine", default="dfs")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--seed", type=int, default=0)
+    cmp = commands.add_parser("compare", help="Compares results against a baseline.")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        print(
+            f"{'case':>22} {'size':>5} {'time':>10} {'us/cell':>9} {'peak':>10} "
+            f"{'live/cell':>10}"
+        )
+        results = []
+        for result in run_suites(
+            args.suites, args.sizes, args.levels, args.solvers, args.engine, args.repeat, args.seed
+        ):
+            print_result(result)
+            results.append(result)
+        save_results(args.path, results, args.engine)
+    else:
+        regressions = compare(
+            load_results(args.baseline), load_results(args.current), args.threshold
+        )
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Caching of generated mazes, such that repeated runs with the same seed do
+not regenerate the maze.
+"""
+import os
+import random
+from collections import OrderedDict
+
+from mazemastery.grid import GridMaze, as_grid
+from mazemastery.maze import GENERATOR_VERSION, maze_factory
+from mazemastery.mazefile import MazeFileError, load_maze, save_maze
+from mazemastery.rng import child_rng
+from mazemastery.types import Coord
+
+CacheKey = tuple[int, int, int, int, int, str]
+
+# Rough size of the bookkeeping of a single entry, in bytes.
+ENTRY_OVERHEAD = 256
+
+
+class MazeCache:
+    """
+    An LRU cache for `maze_factory` keyed by (generator version, level, rows,
+    cols, seed, engine). The in-memory part is bounded by the number of
+    bytes of the cached mazes. If a directory is given, mazes are also
+    stored there as maze files and survive the process.
+
+    Every call returns a fresh copy of the cached maze, so callers may
+    modify it (e.g., the walls of level 8). Mazes without a seed are random
+    and never cached.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, directory: str | None = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[CacheKey, tuple[GridMaze, Coord]] = OrderedDict()
+
+    def get(
+        self,
+        level: int,
+        rows: int,
+        cols: int,
+        seed: int | None,
+        engine: str = "dfs",
+    ) -> tuple[GridMaze, Coord]:
+        """
+        Returns the maze and minotaur coordinates that `maze_factory` creates
+        from the "maze" stream of `seed` (see `rng.child_rng`).
+        """
+        if seed is None:
+            self.misses += 1
+            maze, minotaur_coords = maze_factory(level, rows, cols, engine, random.Random())
+            return as_grid(maze), minotaur_coords
+
+        key = (GENERATOR_VERSION, level, rows, cols, seed, engine)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].copy(), entry[1]
+
+        entry = self._load(key)
+        if entry is not None:
+            self.hits += 1
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            maze, minotaur_coords = maze_factory(
+                level, rows, cols, engine, child_rng(seed, "maze")
+            )
+            entry = (as_grid(maze), minotaur_coords)
+            self._store(key, entry)
+        self._put(key, entry)
+        return entry[0].copy(), entry[1]
+
+    def _put(self, key: CacheKey, entry: tuple[GridMaze, Coord]) -> None:
+        size = entry[0].nbytes + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (maze, _) = self._entries.popitem(last=False)
+            self.size -= maze.nbytes + ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def _path(self, key: CacheKey) -> str:
+        version, level, rows, cols, seed, engine = key
+        assert self.directory is not None
+        return os.path.join(
+            self.directory, f"v{version}-level{level}-{rows}x{cols}-{engine}-{seed}.maze"
+        )
+
+    def _load(self, key: CacheKey) -> tuple[GridMaze, Coord] | None:
+        if self.directory is None:
+            return None
+        try:
+            with load_maze(self._path(key)) as loaded:
+                return loaded.maze.copy(), loaded.minotaur_coords
+        except (FileNotFoundError, MazeFileError):
+            return None
+
+    def _store(self, key: CacheKey, entry: tuple[GridMaze, Coord]) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+
+        # Write to a temporary file first, such that other processes never
+        # see a partially written maze.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        save_maze(tmp_path, entry[0], level=key[1], seed=key[4], minotaur_coords=entry[1])
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Empties the in-memory part of the cache."""
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
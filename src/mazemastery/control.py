@@ -0,0 +1,51 @@
+import threading
+
+
+class Controller:
+    """
+    Pauses the solution thread between moves while debug mode is on.
+
+    The solution thread calls `wait` after every move. The GUI thread calls
+    `pause`, `resume` and `step`, which wake the solution thread right away
+    instead of letting it poll.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._paused = False
+
+        # Moves the solution may still make while paused.
+        self._steps = 0
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def pause(self) -> None:
+        with self._condition:
+            self._paused = True
+            self._steps = 0
+
+    def resume(self) -> None:
+        with self._condition:
+            self._paused = False
+            self._steps = 0
+            self._condition.notify_all()
+
+    def step(self, moves: int = 1) -> None:
+        """Lets a paused solution make `moves` more moves."""
+        with self._condition:
+            self._steps += moves
+            self._condition.notify_all()
+
+    def wait(self) -> None:
+        """Blocks while paused, unless there are steps left."""
+        # Reading the flag without the lock is fine: a move that races with
+        # `pause` is let through, just like a click arriving a move later.
+        if not self._paused:
+            return
+        with self._condition:
+            while self._paused and self._steps == 0:
+                self._condition.wait()
+            if self._paused:
+                self._steps -= 1
@@ -2,6 +2,7 @@ import tkinter as tk
 from typing import TYPE_CHECKING
 
 import mazemastery.api as api
+from mazemastery.grid import are_connected
 from mazemastery.state import State
 from mazemastery.styles import Styles
 from mazemastery.types import Renderer
@@ -58,11 +59,30 @@ class DebugMenu:
         )
         self.debug_button.configure(**Styles.debug_button_style(renderer.cell_size))
 
+        # These buttons let the solution make one or a given number of moves
+        # while in debug mode.
+        self.step_buttons = {
+            "step": tk.Button(renderer.root, text="step", command=lambda: self.handle_step_button(1)),
+            "step_n": tk.Button(
+                renderer.root,
+                text="step n",
+                command=self.handle_step_n_button,
+            ),
+        }
+        self.step_count = tk.Spinbox(renderer.root, from_=1, to=10000, width=5)
+
         row_idx = 1
         self.debug_button.grid(
             row=row_idx, column=1, columnspan=3, sticky="nswe", padx=5, pady=5
         )
         row_idx += 1
+        for button in self.step_buttons.values():
+            button.configure(**Styles.nav_button_style(renderer.cell_size))
+        self.step_count.configure(font=f"Courier {renderer.cell_size // 4}")
+        self.step_buttons["step"].grid(row=row_idx, column=1, sticky="nswe", padx=5, pady=5)
+        self.step_count.grid(row=row_idx, column=2, sticky="nswe", pady=5)
+        self.step_buttons["step_n"].grid(row=row_idx, column=3, sticky="nswe", padx=5, pady=5)
+        row_idx += 1
         for button in self.api_buttons.values():
             # Configure common attributes
             button.configure(**Styles.active_button_style(renderer.cell_size))
@@ -90,6 +110,8 @@ class DebugMenu:
             label.grid(row=row_idx, column=1, columnspan=3, sticky=tk.W)
             row_idx += 1
 
+        # Number of grid rows used by the menu.
+        self.rows = row_idx - 1
         self.renderer = renderer
 
     def update_menu(self) -> None:
@@ -102,6 +124,8 @@ class DebugMenu:
             return
         if self.renderer.debug:
             self.debug_button.configure(text="Exit Debug Mode")
+            for button in self.step_buttons.values():
+                button.configure(state=tk.NORMAL, relief=tk.RAISED)
             for key, button in {**self.api_buttons, **self.nav_buttons}.items():
                 # If there is already a blue gem or a red gem, putting another blue gem is not valid.
                 if key == "put_blue_gem" and (
@@ -119,7 +143,7 @@ class DebugMenu:
                     button.configure(state=tk.NORMAL, relief=tk.RAISED)
         else:
             self.debug_button.configure(text="Debug")
-            for key, button in {**self.api_buttons, **self.nav_buttons}.items():
+            for key, button in {**self.api_buttons, **self.nav_buttons, **self.step_buttons}.items():
                 button.configure(state=tk.DISABLED, relief=tk.FLAT)
 
     def handle_put_red_gem_button(self) -> None:
@@ -136,16 +160,29 @@ class DebugMenu:
         self.renderer.debug = not self.renderer.debug
         state = State()
         if self.renderer.debug:
+            state.controller.pause()
             self.renderer.draw_cloud(api.get_pos())
             self.renderer.draw_hearts(num=state.initial_lives, filled=state.lives)
         else:
             self.renderer.canvas.delete("cloud")
+            state.controller.resume()
         self.update_menu()
 
+    def handle_step_button(self, moves: int) -> None:
+        State().controller.step(moves)
+
+    def handle_step_n_button(self) -> None:
+        try:
+            moves = int(self.step_count.get())
+        except ValueError:
+            return
+        if moves > 0:
+            self.handle_step_button(moves)
+
     def handle_nav_button(self, dir: tuple[int, int]) -> None:
         """
         We cannot use the api call 'set_pos' here because if otherwise the current
-        thread will run into the while loop that only resolves once we leave
+        thread will wait on the controller, which only resumes once we leave
         debug mode. Leaving debug mode will not possible anymore because the
         current thread is blocked.
         """
@@ -154,15 +191,14 @@ class DebugMenu:
             return
         old_pos = api.get_pos()
         new_pos = (old_pos[0] + dir[0], old_pos[1] + dir[1])
-        if new_pos not in state.maze[old_pos]:
+        if not are_connected(state.maze, old_pos, new_pos):
             state.lives -= 1
             new_pos = old_pos
         if state.lives == 0:
             state.renderer.draw_popup("You died!")
             state.dead = True
         state.pos = new_pos
-        self.renderer.draw_row_col_numbers(old_pos, api.get_pos())
-        self.renderer.draw_player(curr_pos=api.get_pos(), prev_pos=old_pos)
+        self.renderer.draw_move(old_pos, api.get_pos())
         self.renderer.draw_cloud(api.get_pos())
         self.renderer.draw_hearts(num=state.initial_lives, filled=state.lives)
         self.update_menu()
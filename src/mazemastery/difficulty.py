@@ -0,0 +1,196 @@
+"""
+Mazes of a given difficulty for levels 6-8, found by rejection sampling.
+
+Candidate mazes are generated from independent streams of a seed and
+scored with a single BFS from the start, which yields the path length and
+number of decision points for every possible minotaur position at once.
+The minotaur is placed on a random cell of the bottom-right quadrant that
+meets the target; candidates without such a cell are rejected. Candidates
+are tried in chunks on a process pool, and the first match in candidate
+order is returned, so the result does not depend on the number of workers.
+"""
+import os
+import random
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import count
+
+from mazemastery.grid import DIRECTIONS, E, N, S, W, GridMaze, as_grid
+from mazemastery.rng import child_rng
+from mazemastery.types import Coord
+
+_DEGREE = bytes(bin(bits & 15).count("1") for bits in range(256))
+
+
+@dataclass
+class Target:
+    """
+    Inclusive (min, max) ranges a maze must meet. None means any value.
+    """
+
+    # Number of steps of the shortest path from the start to the minotaur.
+    path_length: tuple[int, int] | None = None
+    # Fraction of cells with exactly one opening.
+    dead_end_ratio: tuple[float, float] | None = None
+    # Number of cells on the shortest path where the player has to choose
+    # between several ways forward.
+    decision_points: tuple[int, int] | None = None
+
+
+@dataclass
+class SampleResult:
+    maze: GridMaze
+    minotaur_coords: Coord
+    # Index of the candidate, i.e., the stream f"candidate/{index}" of the
+    # seed it was generated from.
+    index: int
+    tried: int
+    rejected: int
+    seconds: float
+
+
+def _in(value: float, bounds: tuple[float, float] | None) -> bool:
+    return bounds is None or bounds[0] <= value <= bounds[1]
+
+
+def score(
+    maze: GridMaze, target: Target, rng: random.Random, start: Coord = (0, 0)
+) -> Coord | None:
+    """
+    Returns a random cell of the bottom-right quadrant such that the maze
+    with the minotaur on it meets `target`, or None if there is none.
+    """
+    rows, cols = maze.rows, maze.cols
+    cells = maze.cells
+    n = rows * cols
+    degree = bytes(cells).translate(_DEGREE)
+    if not _in(degree.count(1) / n, target.dead_end_ratio):
+        return None
+
+    # BFS from the start, counting the decision points on the way to every
+    # cell. The start is one if there is more than one way out of it.
+    s = maze.index(start)
+    deltas = [(d, {N: -cols, W: -1, E: 1, S: cols}[d]) for d in DIRECTIONS]
+    dist = [-1] * n
+    decisions = [0] * n
+    dist[s] = 0
+    queue = deque([s])
+    while queue:
+        k = queue.popleft()
+        bits = cells[k]
+        here = decisions[k] + (degree[k] >= (2 if k == s else 3))
+        for d, delta in deltas:
+            if bits & d and dist[k + delta] < 0:
+                dist[k + delta] = dist[k] + 1
+                decisions[k + delta] = here
+                queue.append(k + delta)
+
+    matches = [
+        (i, j)
+        for i in range(rows // 2, rows)
+        for j in range(cols // 2, cols)
+        if dist[i * cols + j] >= 0
+        and _in(dist[i * cols + j], target.path_length)
+        and _in(decisions[i * cols + j], target.decision_points)
+    ]
+    return rng.choice(matches) if matches else None
+
+
+def sample_chunk(
+    level: int,
+    rows: int,
+    cols: int,
+    target: Target,
+    engine: str,
+    seed: int,
+    indices: range,
+    deadline: float,
+) -> tuple[int, tuple[int, GridMaze, Coord] | None]:
+    """
+    Tries the candidates `indices` in order until one matches or the
+    deadline (in `time.time()` seconds) passes. Returns the number of
+    tried candidates and the match, if any.
+    """
+    from mazemastery.maze import maze_factory
+
+    tried = 0
+    for index in indices:
+        if time.time() > deadline:
+            break
+        tried += 1
+        rng = child_rng(seed, f"candidate/{index}")
+        maze, _ = maze_factory(level, rows, cols, engine, rng)
+        minotaur_coords = score(as_grid(maze), target, rng)
+        if minotaur_coords is not None:
+            return tried, (index, as_grid(maze), minotaur_coords)
+    return tried, None
+
+
+def find_maze(
+    level: int,
+    rows: int,
+    cols: int,
+    target: Target,
+    seed: int = 0,
+    engine: str = "dfs",
+    workers: int | None = 1,
+    budget: float = 10.0,
+    chunksize: int = 4,
+) -> SampleResult:
+    """
+    Samples mazes of `level` until one meets `target`, on `workers`
+    processes (all cores if None, no pool if 1). Raises a `TimeoutError` if
+    no maze is found within `budget` seconds.
+    """
+    if level not in (6, 7, 8):
+        raise ValueError(f"Targets are only supported for levels 6-8, not {level}")
+    start = time.perf_counter()
+    deadline = time.time() + budget
+    chunks = (range(k, k + chunksize) for k in count(0, chunksize))
+    args = (level, rows, cols, target, engine, seed)
+    tried = 0
+
+    def done(found: tuple[int, GridMaze, Coord]) -> SampleResult:
+        index, maze, minotaur_coords = found
+        return SampleResult(
+            maze, minotaur_coords, index, tried, tried - 1, time.perf_counter() - start
+        )
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            n, found = sample_chunk(*args, chunk, deadline)
+            tried += n
+            if found is not None:
+                return done(found)
+            if time.time() > deadline:
+                break
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            pending: deque[Future] = deque()
+
+            def results() -> Iterator[tuple[int, tuple[int, GridMaze, Coord] | None]]:
+                for chunk in chunks:
+                    if time.time() > deadline:
+                        break
+                    pending.append(pool.submit(sample_chunk, *args, chunk, deadline))
+                    if len(pending) >= 2 * workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+            for n, found in results():
+                tried += n
+                if found is not None:
+                    # Later chunks may have been tried as well, but only
+                    # candidates up to the match count.
+                    for future in pending:
+                        future.cancel()
+                    return done(found)
+    raise TimeoutError(
+        f"No maze of level {level} met {target} within {budget}s "
+        f"({tried} tried, {tried} rejected)"
+    )
@@ -0,0 +1,216 @@
+"""
+Shortest distances to a target cell, e.g., the minotaur.
+
+A `DistanceField` is computed once per maze and target with a single BFS
+over the wall bits and stored in `GridMaze.derived`, so all later queries
+(hints, grading, repeated runs on a cached maze) are O(1). When walls of
+the maze change, the field is repaired around the changed wall instead of
+being recomputed.
+"""
+import heapq
+from array import array
+from collections import deque
+
+from mazemastery.grid import DIRECTION_OF, DIRECTIONS, E, N, OFFSETS, OPPOSITE, S, W, GridMaze, as_grid
+from mazemastery.types import AnyMaze, Coord
+
+
+class DistanceField:
+    """
+    Distances from every cell of a maze to `target`, together with the BFS
+    tree that points from every cell one step towards the target.
+    """
+
+    def __init__(
+        self,
+        maze: GridMaze,
+        target: Coord,
+        dist: array | memoryview | None = None,
+        step: bytearray | memoryview | None = None,
+    ):
+        """
+        Args:
+            maze: The maze.
+            target: The cell distances are measured to.
+            dist, step: Precomputed distances and steps, e.g., from a level
+                pack. The field is computed if omitted.
+        """
+        self.maze = maze
+        self.target = target
+        rows, cols = maze.rows, maze.cols
+        n = rows * cols
+
+        # Direction bit, index delta and the direction that leads back.
+        self.moves = moves = [
+            (d, {N: -cols, W: -1, E: 1, S: cols}[d], OPPOSITE[d]) for d in DIRECTIONS
+        ]
+
+        if dist is not None and step is not None:
+            if len(dist) != n or len(step) != n:
+                raise ValueError(f"Expected {n} distances and steps")
+            self.dist, self.step = dist, step
+            return
+
+        # Distance to the target, -1 for unreachable cells.
+        self.dist = dist = array("i", [-1]) * n
+
+        # Direction of the next step towards the target, 0 for the target
+        # and unreachable cells.
+        self.step = step = bytearray(n)
+
+        cells = maze.cells
+        t = maze.index(target)
+        dist[t] = 0
+        queue = deque([t])
+        while queue:
+            k = queue.popleft()
+            bits = cells[k]
+            d_next = dist[k] + 1
+            for d, delta, back in moves:
+                if bits & d:
+                    kk = k + delta
+                    if dist[kk] < 0:
+                        dist[kk] = d_next
+                        step[kk] = back
+                        queue.append(kk)
+
+    def wall_changed(self, c0: Coord, c1: Coord, opened: bool) -> None:
+        """
+        Repairs the field after the wall between `c0` and `c1` changed. Only
+        cells whose distance changes are visited.
+        """
+        k0, k1 = self.maze.index(c0), self.maze.index(c1)
+        d = DIRECTION_OF[(c1[0] - c0[0], c1[1] - c0[1])]
+        if opened:
+            self._shorten(k0, k1, d)
+            self._shorten(k1, k0, OPPOSITE[d])
+        elif self.step[k1] == OPPOSITE[d]:
+            self._detach(k1)
+        elif self.step[k0] == d:
+            self._detach(k0)
+
+    def _shorten(self, a: int, b: int, d: int) -> None:
+        """
+        Propagates shorter distances through the new opening from `a` to its
+        neighbor `b` in direction `d`.
+        """
+        dist, step, cells = self.dist, self.step, self.maze.cells
+        if dist[a] < 0 or 0 <= dist[b] <= dist[a] + 1:
+            return
+        dist[b] = dist[a] + 1
+        step[b] = OPPOSITE[d]
+        queue = deque([b])
+        while queue:
+            k = queue.popleft()
+            bits = cells[k]
+            d_next = dist[k] + 1
+            for d, delta, back in self.moves:
+                if bits & d:
+                    kk = k + delta
+                    if dist[kk] < 0 or d_next < dist[kk]:
+                        dist[kk] = d_next
+                        step[kk] = back
+                        queue.append(kk)
+
+    def _detach(self, root: int) -> None:
+        """
+        Recomputes the distances of the cells whose shortest path led
+        through the wall that was closed next to `root`, i.e., the subtree of
+        `root` in the BFS tree.
+        """
+        dist, step, cells = self.dist, self.step, self.maze.cells
+        subtree = [root]
+        for k in subtree:
+            bits = cells[k]
+            for d, delta, back in self.moves:
+                if bits & d and step[k + delta] == back:
+                    subtree.append(k + delta)
+        for k in subtree:
+            dist[k] = -1
+            step[k] = 0
+
+        # Reattach the subtree from its border, closest cells first.
+        queue = []
+        for k in subtree:
+            bits = cells[k]
+            for d, delta, _ in self.moves:
+                if bits & d and dist[k + delta] >= 0:
+                    queue.append((dist[k + delta] + 1, k, d))
+        heapq.heapify(queue)
+        while queue:
+            d_k, k, d_step = heapq.heappop(queue)
+            if dist[k] >= 0:
+                continue
+            dist[k] = d_k
+            step[k] = d_step
+            bits = cells[k]
+            for d, delta, back in self.moves:
+                if bits & d and dist[k + delta] < 0:
+                    heapq.heappush(queue, (d_k + 1, k + delta, back))
+
+    def distance(self, cell: Coord) -> int | None:
+        """
+        Number of steps of a shortest path from `cell` to the target, or None
+        if the target cannot be reached.
+        """
+        d = self.dist[self.maze.index(cell)]
+        return d if d >= 0 else None
+
+    def next_step(self, cell: Coord) -> Coord | None:
+        """
+        The neighbor of `cell` that is one step closer to the target, or None
+        at the target and for cells that cannot reach it.
+        """
+        d = self.step[self.maze.index(cell)]
+        if not d:
+            return None
+        di, dj = OFFSETS[d]
+        return (cell[0] + di, cell[1] + dj)
+
+    def path(self, cell: Coord) -> list[Coord]:
+        """
+        A shortest path from `cell` to the target, including both. Empty if
+        the target cannot be reached.
+        """
+        if self.distance(cell) is None:
+            return []
+        path = [cell]
+        while (cell := self.next_step(cell)) is not None:  # type: ignore
+            path.append(cell)
+        return path
+
+    def excess(self, start: Coord, steps: int) -> int:
+        """
+        Number of steps more than necessary when walking from `start` to the
+        target in `steps` steps.
+        """
+        d = self.distance(start)
+        if d is None:
+            raise ValueError(f"The target cannot be reached from {start}")
+        return steps - d
+
+
+def distance_field(maze: AnyMaze, target: Coord) -> DistanceField:
+    """
+    Returns the distance field of `maze` towards `target`. The field is
+    computed on first use and kept with the maze, and follows changes made
+    through `open_wall` and `close_wall`. Dict-based mazes are converted to
+    a grid first and their fields are not kept.
+
+    Cells must only open towards cells inside the grid, as is the case for
+    all generated and loaded mazes.
+    """
+    grid = as_grid(maze)
+    field = grid.derived.get(("distance", target))
+    if field is None:
+        field = keep_field(DistanceField(grid, target))
+    return field  # type: ignore
+
+
+def keep_field(field: DistanceField) -> DistanceField:
+    """
+    Stores `field` with its maze, such that `distance_field` returns it.
+    """
+    field.maze.derived[("distance", field.target)] = field
+    field.maze.add_listener(field.wall_changed)
+    return field
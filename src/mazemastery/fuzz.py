@@ -0,0 +1,203 @@
+"""
+Property-based fuzzing of `maze_factory` over many seeds and sizes.
+
+Every case (level, rows, cols, seed) creates a maze from the "maze" stream
+of the seed (see rng.py) and checks it with `validate.validate`. Cases run
+in chunks on a process pool like `batch.generate_batch`. Failures are
+grouped by level and kind and shrunk to a minimal reproducer.
+
+Usage: python -m mazemastery.fuzz [--levels 1-8] [--max-size 12] [--seeds 1000]
+"""
+import argparse
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from mazemastery.maze import maze_factory
+from mazemastery.rng import child_rng
+from mazemastery.validate import validate
+
+# Level, rows, cols and seed of a single maze.
+Case = tuple[int, int, int, int]
+
+
+@dataclass
+class Failure:
+    level: int
+    rows: int
+    cols: int
+    seed: int
+    # Name of the exception, or "invalid" if the maze failed validation.
+    kind: str
+    message: str
+
+    @property
+    def case(self) -> Case:
+        return (self.level, self.rows, self.cols, self.seed)
+
+    def __str__(self) -> str:
+        return (
+            f"maze_factory({self.level}, {self.rows}, {self.cols}, "
+            f"rng=child_rng({self.seed}, 'maze')): {self.kind}: {self.message}"
+        )
+
+
+@dataclass
+class FuzzReport:
+    cases: int
+    seconds: float
+    # Shrunk failures, one per level and kind.
+    failures: list[Failure] = field(default_factory=list)
+    # Number of failing cases per level and kind.
+    counts: dict[tuple[int, str], int] = field(default_factory=dict)
+
+    @property
+    def rate(self) -> float:
+        """Mazes per second."""
+        return self.cases / self.seconds if self.seconds else 0.0
+
+
+def check_case(case: Case, engine: str = "dfs") -> Failure | None:
+    """
+    Creates and validates the maze of a single case. Returns None if the
+    maze is valid.
+    """
+    level, rows, cols, seed = case
+    try:
+        maze, minotaur_coords = maze_factory(level, rows, cols, engine, child_rng(seed, "maze"))
+        errors = validate(maze, (0, 0), minotaur_coords)
+    except Exception as e:
+        return Failure(level, rows, cols, seed, type(e).__name__, str(e))
+    if errors:
+        return Failure(level, rows, cols, seed, "invalid", errors[0])
+    return None
+
+
+def check_chunk(engine: str, cases: list[Case]) -> tuple[int, list[Failure]]:
+    failures = [f for f in (check_case(case, engine) for case in cases) if f is not None]
+    return len(cases), failures
+
+
+def shrink(failure: Failure, engine: str = "dfs", seeds: int = 100) -> Failure:
+    """
+    Greedily makes the rows, cols and seed of a failing case smaller while
+    it still fails in the same way.
+    """
+    def fails(level: int, rows: int, cols: int, seed: int) -> Failure | None:
+        found = check_case((level, rows, cols, seed), engine)
+        return found if found is not None and found.kind == failure.kind else None
+
+    best = failure
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        level, rows, cols, seed = best.case
+        candidates = [
+            *((level, r, cols, seed) for r in sorted({1, rows // 2, rows - 1}) if 0 < r < rows),
+            *((level, rows, c, seed) for c in sorted({1, cols // 2, cols - 1}) if 0 < c < cols),
+            *((level, rows, cols, s) for s in range(min(seed, seeds))),
+        ]
+        for candidate in candidates:
+            found = fails(*candidate)
+            if found is not None:
+                best = found
+                shrunk = True
+                break
+    return best
+
+
+def fuzz_cases(
+    cases: Iterable[Case],
+    workers: int | None = None,
+    engine: str = "dfs",
+    chunksize: int = 256,
+) -> Iterator[tuple[int, list[Failure]]]:
+    """
+    Checks `cases` on `workers` processes (all cores if None, no pool if 1).
+    Yields the number of cases and the failures of every chunk.
+    """
+    cases = iter(cases)
+    chunks = iter(lambda: list(islice(cases, chunksize)), [])
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield check_chunk(engine, chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        max_pending = 2 * workers
+        pending: deque[Future[tuple[int, list[Failure]]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(check_chunk, engine, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def fuzz(
+    levels: Iterable[int],
+    sizes: Iterable[tuple[int, int]],
+    seeds: Iterable[int],
+    workers: int | None = None,
+    engine: str = "dfs",
+    chunksize: int = 256,
+) -> FuzzReport:
+    """
+    Checks every level for every size and seed, and shrinks the first
+    failure of each level and kind.
+    """
+    levels, sizes = list(levels), list(sizes)
+    cases = (
+        (level, rows, cols, seed)
+        for seed in seeds
+        for level in levels
+        for rows, cols in sizes
+    )
+    start = time.perf_counter()
+    report = FuzzReport(0, 0.0)
+    first: dict[tuple[int, str], Failure] = {}
+    for count, failures in fuzz_cases(cases, workers, engine, chunksize):
+        report.cases += count
+        for failure in failures:
+            key = (failure.level, failure.kind)
+            report.counts[key] = report.counts.get(key, 0) + 1
+            first.setdefault(key, failure)
+    report.seconds = time.perf_counter() - start
+    report.failures = [shrink(failure, engine) for failure in first.values()]
+    return report
+
+
+def parse_range(text: str) -> range:
+    """Parses "3" or "1-8" into a range."""
+    lo, _, hi = text.partition("-")
+    return range(int(lo), int(hi or lo) + 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fuzzes maze_factory.")
+    parser.add_argument("--levels", type=parse_range, default=range(1, 9))
+    parser.add_argument("--min-size", type=int, default=1)
+    parser.add_argument("--max-size", type=int, default=12)
+    parser.add_argument("--seeds", type=parse_range, default=range(0, 1000))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--engine", default="dfs")
+    args = parser.parse_args()
+
+    sizes = [
+        (rows, cols)
+        for rows in range(args.min_size, args.max_size + 1)
+        for cols in range(args.min_size, args.max_size + 1)
+    ]
+    report = fuzz(args.levels, sizes, args.seeds, args.workers, args.engine)
+    print(f"{report.cases} mazes in {report.seconds:.1f}s ({report.rate:.0f} mazes/s)")
+    for failure in report.failures:
+        print(f"{report.counts[failure.level, failure.kind]:>8} failures like {failure}")
+
+
+if __name__ == "__main__":
+    main()
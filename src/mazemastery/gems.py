@@ -0,0 +1,104 @@
+"""
+Cells marked with gems.
+
+A `GemLayer` holds the gems of one color. Membership is O(1): grid mazes
+use one byte per cell, indexed like `GridMaze.cells`, other mazes a set.
+The layer is also a sequence of the cells in the order the gems were put,
+which is what `State.blue_gem_coords` and `red_gem_coords` return. It
+stands in for the lists these used to be: `append`, `in`, `len` and `==`
+against lists work as before, except that a cell is only listed once.
+"""
+from collections.abc import Iterable, Iterator, Sequence
+from typing import overload
+
+from mazemastery.grid import GridMaze
+from mazemastery.types import Coord, PlayableMaze
+
+
+class GemLayer(Sequence[Coord]):
+    def __init__(self, maze: PlayableMaze, cells: Iterable[Coord] = ()):
+        self._maze = maze
+        self._rows, self._cols = 0, 0
+        self._bitmap: bytearray | None = None
+        self._set: set[Coord] = set()
+        if isinstance(maze, GridMaze):
+            self._rows, self._cols = maze.rows, maze.cols
+            self._bitmap = bytearray(maze.rows * maze.cols)
+        self._cells: list[Coord] = []
+        for cell in cells:
+            self.add(cell)
+
+    def _index(self, cell: object) -> int | None:
+        if not isinstance(cell, tuple) or len(cell) != 2:
+            return None
+        i, j = cell
+        if not (0 <= i < self._rows and 0 <= j < self._cols):
+            return None
+        return i * self._cols + j
+
+    def add(self, cell: Coord) -> bool:
+        """
+        Puts a gem on `cell`. Returns False if there already was one. Raises
+        KeyError if `cell` is not part of the maze.
+        """
+        if self._bitmap is not None:
+            k = self._index(cell)
+            if k is None:
+                raise KeyError(cell)
+            if self._bitmap[k]:
+                return False
+            self._bitmap[k] = 1
+        else:
+            if cell not in self._maze:
+                raise KeyError(cell)
+            if cell in self._set:
+                return False
+            self._set.add(cell)
+        self._cells.append(cell)
+        return True
+
+    def append(self, cell: Coord) -> None:
+        """Same as `add`, for code that treats the layer as a list."""
+        self.add(cell)
+
+    def clear(self) -> None:
+        """Removes all gems in O(number of gems)."""
+        if self._bitmap is not None:
+            cols = self._cols
+            for i, j in self._cells:
+                self._bitmap[i * cols + j] = 0
+        else:
+            self._set.clear()
+        self._cells.clear()
+
+    def __contains__(self, cell: object) -> bool:
+        if self._bitmap is not None:
+            k = self._index(cell)
+            return k is not None and bool(self._bitmap[k])
+        return cell in self._set
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __iter__(self) -> Iterator[Coord]:
+        return iter(self._cells)
+
+    @overload
+    def __getitem__(self, index: int) -> Coord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Coord]: ...
+
+    def __getitem__(self, index: int | slice) -> Coord | list[Coord]:
+        return self._cells[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (GemLayer, list)):
+            return self._cells == list(other)
+        return NotImplemented
+
+    # Layers change as gems are put, so they cannot be hashed, like lists.
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"GemLayer({self._cells!r})"
@@ -0,0 +1,447 @@
+"""
+Grading solutions on many mazes at once.
+
+A solution is given as "module:function", e.g., "solutions:level7", where
+the module is importable from the current directory or is a path to a
+Python file. Every job (solution, level, seed, rows, cols) runs the
+solution headless (see headless.py) on the maze `run` would create for the
+seed, with a limit on the number of moves and on the wall-clock time. Jobs
+run on worker processes, and a worker whose job overruns the time limit
+(e.g., because the solution catches the timeout) is killed and replaced.
+
+The module of a solution is executed anew for every job, so solutions that
+keep global state (like `solutions.level8`) start from scratch each time.
+Modules must not call `run` when imported.
+
+Usage: python -m mazemastery.grader solutions:level6 solutions:level7 --levels 6-8
+"""
+import argparse
+import contextlib
+import importlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from multiprocessing.connection import Connection, wait
+from types import ModuleType
+
+from mazemastery.api import run_headless
+from mazemastery.fuzz import parse_range
+from mazemastery.maze import maze_factory
+from mazemastery.rng import child_rng
+from mazemastery.solvers import bfs
+
+# Solution, level, seed, rows and cols of a single run.
+Job = tuple[str, int, int, int, int]
+
+# Limit on the moves of a job if none is given, relative to the number of
+# cells. A depth-first search needs about two moves per cell.
+MOVES_PER_CELL = 10
+
+# Seconds after the timeout of a job at which its worker is killed.
+KILL_AFTER = 2.0
+
+
+class JobTimeout(BaseException):
+    """
+    Raised in a solution that exceeds its time limit. Derives from
+    `BaseException` like `StopRun`, but a solution can still catch it, which
+    is why workers are killed as a last resort.
+    """
+
+
+@dataclass
+class GradeResult:
+    solution: str
+    level: int
+    seed: int
+    rows: int
+    cols: int
+    # "found", "dead", "stopped" or "lost" (see `RunResult.outcome`), or
+    # "timeout" and "error" if the solution did not return.
+    outcome: str
+    lives: int
+    moves: int
+    # Length of the shortest path to the minotaur.
+    optimal: int
+    seconds: float
+    # Moves until the minotaur was first reached divided by `optimal`.
+    ratio: float | None = None
+    error: str = ""
+
+    @property
+    def found(self) -> bool:
+        return self.outcome == "found"
+
+
+@dataclass
+class Summary:
+    solution: str
+    level: int
+    jobs: int = 0
+    found: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    # Totals over the jobs where the solution returned (or was stopped),
+    # i.e., excluding timeouts and errors.
+    lives: int = 0
+    moves: int = 0
+    ratio: float = 0.0
+
+    def add(self, result: GradeResult) -> None:
+        self.jobs += 1
+        if result.outcome == "timeout":
+            self.timeouts += 1
+            return
+        if result.outcome == "error":
+            self.errors += 1
+            return
+        self.lives += result.lives
+        self.moves += result.moves
+        if result.found:
+            self.found += 1
+            self.ratio += result.ratio or 0.0
+
+    @property
+    def finished(self) -> int:
+        """Jobs that neither timed out nor failed with an error."""
+        return self.jobs - self.timeouts - self.errors
+
+    @property
+    def found_rate(self) -> float:
+        return self.found / self.jobs if self.jobs else 0.0
+
+    @property
+    def mean_lives(self) -> float | None:
+        return self.lives / self.finished if self.finished else None
+
+    @property
+    def mean_moves(self) -> float | None:
+        return self.moves / self.finished if self.finished else None
+
+    @property
+    def mean_ratio(self) -> float | None:
+        """Mean optimality ratio over the jobs where the minotaur was found."""
+        return self.ratio / self.found if self.found else None
+
+
+# Whether a module was imported by this process already, such that it needs
+# to be reloaded to reset its globals.
+_imported: set[str] = set()
+
+
+def load_solution(spec: str) -> Callable[[], None]:
+    """
+    Executes the module of `spec` ("module:function" or "path.py:function")
+    and returns the function.
+    """
+    name, sep, function = spec.rpartition(":")
+    if not sep or not name or not function:
+        raise ValueError(f"Expected 'module:function', got {spec!r}")
+    module: ModuleType
+    if name.endswith(".py"):
+        file_spec = importlib.util.spec_from_file_location("_graded_solution", name)
+        if file_spec is None or file_spec.loader is None:
+            raise ImportError(f"Cannot load {name}")
+        module = importlib.util.module_from_spec(file_spec)
+        file_spec.loader.exec_module(module)
+    elif name in _imported:
+        module = importlib.reload(sys.modules[name])
+    else:
+        module = importlib.import_module(name)
+        _imported.add(name)
+    return getattr(module, function)
+
+
+@contextlib.contextmanager
+def time_limit(seconds: float | None) -> Iterator[None]:
+    """
+    Raises `JobTimeout` in the block after `seconds`. Relies on SIGALRM, so
+    there is no limit on platforms without it or outside the main thread.
+    """
+    usable = hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+    if seconds is None or not usable:
+        yield
+        return
+
+    def handler(signum: int, frame: object) -> None:
+        raise JobTimeout(f"Exceeded the limit of {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)  # type: ignore
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def grade_job(
+    job: Job,
+    engine: str = "dfs",
+    max_moves: int | None = None,
+    timeout: float | None = 10.0,
+) -> GradeResult:
+    """
+    Runs a single job. Output of the solution is discarded.
+    """
+    spec, level, seed, rows, cols = job
+    maze, minotaur_coords = maze_factory(level, rows, cols, engine, child_rng(seed, "maze"))
+    optimal = bfs(maze, (0, 0), minotaur_coords).steps or 0
+    if max_moves is None:
+        max_moves = MOVES_PER_CELL * len(maze)
+
+    # The same seeding as `run`, so the job can be replayed with it.
+    random.seed(seed)
+    start = time.perf_counter()
+    try:
+        # Only the solution's own prints end up here; the game reports to the
+        # renderer (see `NullRenderer.log`).
+        with contextlib.redirect_stdout(io.StringIO()), time_limit(timeout):
+            solve = load_solution(spec)
+            result = run_headless(maze, minotaur_coords, level, solve, max_moves)
+    except JobTimeout as e:
+        seconds = time.perf_counter() - start
+        return GradeResult(spec, level, seed, rows, cols, "timeout", 0, 0, optimal, seconds, error=str(e))
+    except (Exception, SystemExit) as e:
+        seconds = time.perf_counter() - start
+        message = f"{type(e).__name__}: {e}"
+        return GradeResult(spec, level, seed, rows, cols, "error", 0, 0, optimal, seconds, error=message)
+
+    ratio = None
+    if result.found and result.moves_to_minotaur is not None and optimal:
+        ratio = result.moves_to_minotaur / optimal
+    return GradeResult(
+        spec,
+        level,
+        seed,
+        rows,
+        cols,
+        result.outcome,
+        result.lives,
+        result.moves,
+        optimal,
+        result.seconds,
+        ratio,
+    )
+
+
+def failed_job(job: Job, engine: str, outcome: str, message: str, seconds: float) -> GradeResult:
+    """Result of a job whose worker was lost."""
+    spec, level, seed, rows, cols = job
+    maze, minotaur_coords = maze_factory(level, rows, cols, engine, child_rng(seed, "maze"))
+    optimal = bfs(maze, (0, 0), minotaur_coords).steps or 0
+    return GradeResult(spec, level, seed, rows, cols, outcome, 0, 0, optimal, seconds, error=message)
+
+
+def serve(conn: Connection, engine: str, max_moves: int | None, timeout: float | None) -> None:
+    """Runs the jobs received on `conn` until it receives None."""
+    while (job := conn.recv()) is not None:
+        conn.send(grade_job(job, engine, max_moves, timeout))
+
+
+class Worker:
+    """A process running one job at a time, which can be killed."""
+
+    def __init__(self, engine: str, max_moves: int | None, timeout: float | None):
+        self.args = (engine, max_moves, timeout)
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=serve, args=(child, *self.args), daemon=True)
+        self.process.start()
+        child.close()
+
+        # Index of the job currently running, the job, and when it was sent.
+        self.job: tuple[int, Job] | None = None
+        self.started = 0.0
+
+    def submit(self, index: int, job: Job) -> None:
+        self.conn.send(job)
+        self.job = (index, job)
+        self.started = time.monotonic()
+
+    def close(self) -> None:
+        if self.job is None and self.process.is_alive():
+            self.conn.send(None)
+            self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def grade_pool(
+    jobs: Iterable[Job],
+    workers: int,
+    engine: str,
+    max_moves: int | None,
+    timeout: float | None,
+) -> Iterator[GradeResult]:
+    """
+    Runs `jobs` on `workers` processes and yields the results in order. A
+    worker is killed and replaced if its job runs `KILL_AFTER` seconds past
+    `timeout`, or if it dies, and the job counts as a timeout or error.
+    """
+    todo = enumerate(jobs)
+    done: dict[int, GradeResult] = {}
+    next_index = 0
+    pool = [Worker(engine, max_moves, timeout) for _ in range(workers)]
+    try:
+        while True:
+            for worker in pool:
+                if worker.job is None and (item := next(todo, None)) is not None:
+                    worker.submit(*item)
+            busy = [worker for worker in pool if worker.job is not None]
+            if not busy:
+                break
+            limit = None
+            if timeout is not None:
+                deadline = min(worker.started for worker in busy) + timeout + KILL_AFTER
+                limit = max(0.0, deadline - time.monotonic())
+            ready = wait([worker.conn for worker in busy], limit)
+
+            for k, worker in enumerate(pool):
+                if worker.job is None:
+                    continue
+                index, job = worker.job
+                seconds = time.monotonic() - worker.started
+                if worker.conn in ready:
+                    try:
+                        done[index] = worker.conn.recv()
+                        worker.job = None
+                        continue
+                    except EOFError:
+                        done[index] = failed_job(job, engine, "error", "The worker process died", seconds)
+                elif timeout is not None and seconds > timeout + KILL_AFTER:
+                    message = f"Killed after {seconds:.1f}s"
+                    done[index] = failed_job(job, engine, "timeout", message, seconds)
+                else:
+                    continue
+                worker.close()
+                pool[k] = Worker(*worker.args)
+
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+    finally:
+        for worker in pool:
+            worker.close()
+
+
+def grade(
+    solutions: Iterable[str],
+    levels: Iterable[int],
+    seeds: Iterable[int],
+    sizes: Iterable[tuple[int, int]],
+    workers: int | None = None,
+    engine: str = "dfs",
+    max_moves: int | None = None,
+    timeout: float | None = 10.0,
+) -> Iterator[GradeResult]:
+    """
+    Runs every solution on every level, seed and (rows, cols) in `sizes`
+    on `workers` processes (all cores if None). Results are yielded in the
+    order of the jobs as soon as they are available. With one worker and no
+    timeout, jobs run in this process.
+
+    Args:
+        max_moves: Moves after which a job is stopped. Defaults to
+            `MOVES_PER_CELL` times the number of cells.
+        timeout: Seconds after which a job is aborted, None for no limit.
+    """
+    solutions, levels, seeds, sizes = list(solutions), list(levels), list(seeds), list(sizes)
+    jobs = (
+        (spec, level, seed, rows, cols)
+        for spec in solutions
+        for level in levels
+        for seed in seeds
+        for rows, cols in sizes
+    )
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 and timeout is None:
+        for job in jobs:
+            yield grade_job(job, engine, max_moves, timeout)
+        return
+    yield from grade_pool(jobs, workers, engine, max_moves, timeout)
+
+
+def summarize(results: Iterable[GradeResult]) -> list[Summary]:
+    """Aggregates results per solution and level, in order of appearance."""
+    summaries: dict[tuple[str, int], Summary] = {}
+    for result in results:
+        key = (result.solution, result.level)
+        if key not in summaries:
+            summaries[key] = Summary(*key)
+        summaries[key].add(result)
+    return list(summaries.values())
+
+
+def format_summary(summaries: Iterable[Summary]) -> str:
+    lines = [
+        f"{'solution':<30} {'level':>5} {'jobs':>6} {'found':>7} {'lives':>6} "
+        f"{'moves':>8} {'ratio':>6} {'timeout':>7} {'error':>6}"
+    ]
+    for s in summaries:
+        lives = f"{s.mean_lives:.2f}" if s.mean_lives is not None else "-"
+        moves = f"{s.mean_moves:.1f}" if s.mean_moves is not None else "-"
+        ratio = f"{s.mean_ratio:.2f}" if s.mean_ratio is not None else "-"
+        lines.append(
+            f"{s.solution:<30} {s.level:>5} {s.jobs:>6} {s.found_rate:>7.1%} "
+            f"{lives:>6} {moves:>8} {ratio:>6} {s.timeouts:>7} {s.errors:>6}"
+        )
+    return "\n".join(lines)
+
+
+def parse_size(text: str) -> tuple[int, int]:
+    """Parses "10" or "10x20" into rows and cols."""
+    rows, _, cols = text.partition("x")
+    return int(rows), int(cols or rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Grades solutions on many mazes.")
+    parser.add_argument("solutions", nargs="+", help="module:function or path.py:function")
+    parser.add_argument("--levels", type=parse_range, default=range(1, 9))
+    parser.add_argument("--seeds", type=parse_range, default=range(0, 200))
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=[(10, 10)])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--engine", default="dfs")
+    parser.add_argument("--max-moves", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--out", help="Writes every result as a line of JSON to this file.")
+    args = parser.parse_args()
+
+    # Solutions are looked up like in a script run from this directory.
+    sys.path.insert(0, os.getcwd())
+    results = grade(
+        args.solutions,
+        args.levels,
+        args.seeds,
+        args.sizes,
+        args.workers,
+        args.engine,
+        args.max_moves,
+        args.timeout,
+    )
+    start = time.perf_counter()
+    with open(args.out, "w") if args.out else contextlib.nullcontext() as out:
+        def record(results: Iterable[GradeResult]) -> Iterator[GradeResult]:
+            for result in results:
+                if out is not None:
+                    out.write(json.dumps(asdict(result)) + "\n")
+                yield result
+
+        summaries = summarize(record(results))
+    print(format_summary(summaries))
+    print(f"{sum(s.jobs for s in summaries)} jobs in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
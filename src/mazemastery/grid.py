@@ -0,0 +1,264 @@
+from collections.abc import Callable, Iterator, Mapping
+from itertools import permutations
+import random
+import weakref
+
+from mazemastery.types import Coord, Maze
+
+# A cell stores one bit per direction. A set bit means that the wall towards
+# the neighbor in that direction has been removed, so a freshly created grid
+# is a set of fully walled-in cells.
+N, W, E, S = 1, 2, 4, 8
+DIRECTIONS = (N, W, E, S)
+OFFSETS = {N: (-1, 0), W: (0, -1), E: (0, 1), S: (1, 0)}
+OPPOSITE = {N: S, W: E, E: W, S: N}
+DIRECTION_OF = {offset: d for d, offset in OFFSETS.items()}
+
+# All 24 orders in which the neighbors of a cell can be listed. Each cell
+# stores an index into this table, such that users cannot rely on a specific
+# neighbor order (see `randomize_neighbor_order` in maze.py).
+ORDERS = tuple(permutations(DIRECTIONS))
+
+# Lookup table from (order, wall bits) to the offsets of the open neighbors.
+_NEIGHBOR_OFFSETS = tuple(
+    tuple(OFFSETS[d] for d in order if bits & d)
+    for order in ORDERS
+    for bits in range(16)
+)
+_BYTE_TO_ORDER = bytes(b % len(ORDERS) for b in range(256))
+
+# Called with the two cells and whether the wall between them was opened
+# (True) or closed (False).
+WallListener = Callable[[Coord, Coord, bool], None]
+
+
+class GridMaze(Mapping[Coord, list[Coord]]):
+    """
+    A maze on a `rows` x `cols` grid that stores one byte of wall bits per
+    cell, indexed by `i * cols + j`.
+
+    The class is a read-only mapping from cells to lists of neighbors, so it
+    can be used wherever a dict-based `Maze` is read. Code that knows about
+    the grid should prefer `connected`, `is_open` and `neighbors`, which run
+    in O(1) and do not allocate.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        cells: bytearray | memoryview | None = None,
+        order: bytearray | memoryview | None = None,
+    ):
+        """
+        Args:
+            rows: Number of rows of the maze.
+            cols: Number of columns of the maze.
+            cells: Wall bits of each cell in row-major order. A maze without
+                any openings is created if omitted.
+            order: Index into `ORDERS` for each cell, determining the order in
+                which neighbors are listed. The canonical order (N, W, E, S)
+                is used if omitted.
+        """
+        if rows <= 0 or cols <= 0:
+            raise ValueError(f"Invalid maze size: {rows}x{cols}")
+        if cells is None:
+            cells = bytearray(rows * cols)
+        if len(cells) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cells, got {len(cells)}")
+        if order is not None and len(order) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} orders, got {len(order)}")
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.order = order
+
+        # Data computed from the walls, e.g., distance fields (see
+        # distance.py), keyed by its kind. Such data registers a listener to
+        # stay up to date when walls change.
+        self.derived: dict[object, object] = {}
+
+        # Notified whenever `open_wall` or `close_wall` changes a wall.
+        # Writing to `cells` directly does not notify anyone. Bound methods
+        # are held weakly (see `add_listener`).
+        self.listeners: list[Callable[[], WallListener | None]] = []
+
+    @classmethod
+    def from_dict(cls, maze: Maze) -> "GridMaze":
+        """
+        Converts a dict-based maze into a grid maze. The order of the
+        neighbor lists is preserved.
+        """
+        rows = max(i for i, _ in maze.keys()) + 1
+        cols = max(j for _, j in maze.keys()) + 1
+        grid = cls(rows, cols, order=bytearray(rows * cols))
+        for (i, j), neighbors in maze.items():
+            listed = []
+            for ii, jj in neighbors:
+                d = DIRECTION_OF.get((ii - i, jj - j))
+                if d is None or not grid.in_bounds((ii, jj)):
+                    raise ValueError(f"{(ii, jj)} is not a neighbor of {(i, j)}")
+                grid.open_wall((i, j), (ii, jj))
+                if d not in listed:
+                    listed.append(d)
+            listed += [d for d in DIRECTIONS if d not in listed]
+            grid.order[i * cols + j] = ORDERS.index(tuple(listed))  # type: ignore
+        return grid
+
+    def to_dict(self) -> Maze:
+        return {cell: self[cell] for cell in self}
+
+    def __getstate__(self) -> dict[str, object]:
+        # Derived data and listeners stay with the process that created them
+        # (weak references cannot be pickled); like `copy`, a pickled maze
+        # only carries its walls.
+        state = self.__dict__.copy()
+        state["derived"] = {}
+        state["listeners"] = []
+        return state
+
+    def copy(self) -> "GridMaze":
+        return GridMaze(
+            self.rows,
+            self.cols,
+            bytearray(self.cells),
+            bytearray(self.order) if self.order is not None else None,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used to store the cells (and neighbor orders)."""
+        return len(self.cells) + (len(self.order) if self.order is not None else 0)
+
+    def in_bounds(self, cell: Coord) -> bool:
+        i, j = cell
+        return 0 <= i < self.rows and 0 <= j < self.cols
+
+    def index(self, cell: Coord) -> int:
+        i, j = cell
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise KeyError(cell)
+        return i * self.cols + j
+
+    def coord(self, index: int) -> Coord:
+        return divmod(index, self.cols)
+
+    def is_open(self, cell: Coord, direction: int) -> bool:
+        """Whether there is no wall on the `direction` side of `cell`."""
+        return bool(self.cells[self.index(cell)] & direction)
+
+    def connected(self, c0: Coord, c1: Coord) -> bool:
+        """Whether `c1` can be reached from `c0` in a single step."""
+        i, j = c0
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise KeyError(c0)
+        d = DIRECTION_OF.get((c1[0] - i, c1[1] - j))
+        return d is not None and bool(self.cells[i * self.cols + j] & d)
+
+    def open_wall(self, c0: Coord, c1: Coord) -> None:
+        """Removes the wall between the adjacent cells `c0` and `c1`."""
+        d = DIRECTION_OF.get((c1[0] - c0[0], c1[1] - c0[1]))
+        if d is None:
+            raise ValueError(f"{c1} is not adjacent to {c0}")
+        k0 = self.index(c0)
+        k1 = self.index(c1)
+        if self.cells[k0] & d:
+            return
+        self.cells[k0] |= d
+        self.cells[k1] |= OPPOSITE[d]
+        self.notify(c0, c1, True)
+
+    def close_wall(self, c0: Coord, c1: Coord) -> None:
+        """Puts up the wall between the adjacent cells `c0` and `c1`."""
+        d = DIRECTION_OF.get((c1[0] - c0[0], c1[1] - c0[1]))
+        if d is None:
+            raise ValueError(f"{c1} is not adjacent to {c0}")
+        k0 = self.index(c0)
+        k1 = self.index(c1)
+        if not self.cells[k0] & d:
+            return
+        self.cells[k0] &= ~d
+        self.cells[k1] &= ~OPPOSITE[d]
+        self.notify(c0, c1, False)
+
+    def add_listener(self, listener: WallListener) -> None:
+        """
+        Calls `listener` whenever a wall changes. A bound method does not keep
+        its object alive and is dropped once the object is gone, so, e.g., a
+        renderer of a cached maze can be garbage collected after its run.
+        """
+        if hasattr(listener, "__self__"):
+            self.listeners.append(weakref.WeakMethod(listener))  # type: ignore
+        else:
+            self.listeners.append(lambda: listener)
+
+    def remove_listener(self, listener: WallListener) -> None:
+        self.listeners = [ref for ref in self.listeners if ref() not in (None, listener)]
+
+    def notify(self, c0: Coord, c1: Coord, opened: bool) -> None:
+        dead = False
+        for ref in self.listeners:
+            listener = ref()
+            if listener is None:
+                dead = True
+            else:
+                listener(c0, c1, opened)
+        if dead:
+            self.listeners = [ref for ref in self.listeners if ref() is not None]
+
+    def degree(self, cell: Coord) -> int:
+        """Number of open sides of `cell`."""
+        return bin(self.cells[self.index(cell)]).count("1")
+
+    def neighbors(self, cell: Coord) -> Iterator[Coord]:
+        return iter(self[cell])
+
+    def shuffle_neighbors(self, rng: random.Random | None = None) -> None:
+        """
+        Assigns a random neighbor order to each cell.
+        """
+        # Mapping random bytes onto the orders slightly favors the first 16
+        # orders (11/256 vs. 10/256), which is fine for our purpose.
+        rand = (rng or random).randbytes(self.rows * self.cols)  # type: ignore
+        self.order = bytearray(rand.translate(_BYTE_TO_ORDER))
+
+    def __getitem__(self, cell: Coord) -> list[Coord]:
+        i, j = cell
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise KeyError(cell)
+        k = i * self.cols + j
+        o = self.order[k] if self.order is not None else 0
+        return [(i + di, j + dj) for di, dj in _NEIGHBOR_OFFSETS[o * 16 + self.cells[k]]]
+
+    def __contains__(self, cell: object) -> bool:
+        if not isinstance(cell, tuple) or len(cell) != 2:
+            return False
+        i, j = cell
+        return 0 <= i < self.rows and 0 <= j < self.cols
+
+    def __iter__(self) -> Iterator[Coord]:
+        for i in range(self.rows):
+            for j in range(self.cols):
+                yield (i, j)
+
+    def __len__(self) -> int:
+        return self.rows * self.cols
+
+    def __repr__(self) -> str:
+        return f"GridMaze(rows={self.rows}, cols={self.cols})"
+
+
+def are_connected(maze: Maze | GridMaze, c0: Coord, c1: Coord) -> bool:
+    """
+    Whether `c1` is a neighbor of `c0`, for both dict-based and grid mazes.
+    """
+    if isinstance(maze, GridMaze):
+        return maze.connected(c0, c1)
+    return c1 in maze[c0]
+
+
+def as_grid(maze: Maze | GridMaze) -> GridMaze:
+    """Returns `maze` as a grid maze, converting it if necessary."""
+    if isinstance(maze, GridMaze):
+        return maze
+    return GridMaze.from_dict(maze)
@@ -0,0 +1,104 @@
+"""
+Running solutions without a display, e.g., to grade them.
+
+`NullRenderer` has the interface that the API uses of `Renderer` but draws
+nothing, so `run(..., headless=True)` runs a solution at full speed and
+returns a `RunResult` instead of opening a window.
+"""
+from dataclasses import dataclass, field
+
+from mazemastery.types import Coord, PlayableMaze
+
+
+class StopRun(BaseException):
+    """
+    Raised by `set_pos` to end a headless run early. Derives from
+    `BaseException`, so that solutions catching `Exception` cannot ignore it.
+    """
+
+
+class MoveLimitExceeded(StopRun):
+    """Raised once a headless run exceeds its `max_moves`."""
+
+
+class PlayerDied(StopRun):
+    """
+    Raised on moves after the player died. A window keeps showing the game
+    while the solution ignores this, but nobody watches a headless run.
+    """
+
+
+class NullRenderer:
+    # Messages kept per run, such that solutions making millions of invalid
+    # moves do not fill the memory.
+    max_messages = 100
+
+    def __init__(self, maze: PlayableMaze, minotaur_coords: Coord):
+        self.maze = maze
+        self.minotaur_coords = minotaur_coords
+        self.delay = 0
+        self.debug = False
+
+        # Texts of the popups that would have been shown, in order.
+        self.popups: list[str] = []
+
+        # Messages that would have been printed (see `log`), in order.
+        self.messages: list[str] = []
+
+    def initial_draw(self) -> None:
+        pass
+
+    def update_draw(self, old_pos: Coord, curr_pos: Coord, lives: int) -> None:
+        pass
+
+    def draw_popup(self, text: str, color: str = "black") -> None:
+        self.popups.append(text)
+
+    def log(self, message: str) -> None:
+        if len(self.messages) < self.max_messages:
+            self.messages.append(message)
+
+    def draw_gems(self) -> None:
+        pass
+
+    def push_blue_gem_buffer(self, pos: Coord) -> None:
+        pass
+
+    def push_red_gem_buffer(self, pos: Coord) -> None:
+        pass
+
+    def clear_gems(self, color: str) -> None:
+        pass
+
+
+@dataclass
+class RunResult:
+    # Whether the player reached the minotaur (and stayed there, except on
+    # level 1, where passing by is enough).
+    found: bool
+    dead: bool
+    # Calls of `set_pos`, including invalid moves.
+    moves: int
+    # Calls of `set_pos` until the player first stood on the minotaur, None
+    # if it never did.
+    moves_to_minotaur: int | None
+    lives: int
+    pos: Coord
+    seconds: float
+    # Whether the run was stopped after `max_moves` moves.
+    stopped: bool = False
+    popups: list[str] = field(default_factory=list)
+    # The first messages about the game, e.g., invalid moves (see
+    # `NullRenderer.max_messages`).
+    messages: list[str] = field(default_factory=list)
+
+    @property
+    def outcome(self) -> str:
+        """One of "found", "dead", "stopped" and "lost"."""
+        if self.found:
+            return "found"
+        if self.dead:
+            return "dead"
+        if self.stopped:
+            return "stopped"
+        return "lost"
@@ -0,0 +1,137 @@
+"""
+Unbounded mazes whose cells are generated on first access.
+
+The openings of a cell are a pure function of the seed and its
+coordinates, computed with the sidewinder rule on hashed coin flips: in
+every row but the first, cells are joined to the east with probability
+1/2, and every run of joined cells opens to the north at one hashed cell.
+The first row is a single corridor. This is a spanning tree of the
+quadrant i, j >= 0, so every cell is reachable from (0, 0). Only cells
+that have been accessed are kept, so memory grows with the explored area.
+"""
+from collections.abc import Iterator, Mapping
+
+from mazemastery.grid import DIRECTION_OF, E, N, ORDERS, OFFSETS, S, W
+from mazemastery.types import Coord
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(x: int) -> int:
+    """The splitmix64 finalizer."""
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK
+    return x ^ (x >> 31)
+
+
+class HashedMaze:
+    """
+    A maze on the unbounded quadrant i, j >= 0. Can be read like a
+    dict-based maze, i.e., `maze[cell]` lists the neighbors of a cell in a
+    hashed order, but it has no size and cannot be iterated.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        # Wall bits (see grid.py) of every cell accessed so far.
+        self.cells: dict[Coord, int] = {}
+
+    def _hash(self, i: int, j: int, salt: int) -> int:
+        return _mix((self.seed * 0x9E3779B97F4A7C15 + i * 0xD1B54A32D192ED03
+                     + j * 0x8CB92BA72F3D8DD7 + salt) & _MASK)
+
+    def _east(self, i: int, j: int) -> bool:
+        return i == 0 or bool(self._hash(i, j, 0) & 1)
+
+    def _up(self, i: int, j: int) -> int:
+        """Column in which the run containing (i, j) opens to the north."""
+        j0 = j
+        while j0 > 0 and self._east(i, j0 - 1):
+            j0 -= 1
+        j1 = j
+        while self._east(i, j1):
+            j1 += 1
+        return j0 + self._hash(i, j0, 1) % (j1 - j0 + 1)
+
+    def bits(self, cell: Coord) -> int:
+        """Wall bits of `cell`, computed on first access."""
+        bits = self.cells.get(cell)
+        if bits is None:
+            i, j = cell
+            if i < 0 or j < 0:
+                raise KeyError(cell)
+            bits = 0
+            if self._east(i, j):
+                bits |= E
+            if j > 0 and self._east(i, j - 1):
+                bits |= W
+            if i > 0 and self._up(i, j) == j:
+                bits |= N
+            if self._up(i + 1, j) == j:
+                bits |= S
+            self.cells[cell] = bits
+        return bits
+
+    def connected(self, c0: Coord, c1: Coord) -> bool:
+        d = DIRECTION_OF.get((c1[0] - c0[0], c1[1] - c0[1]))
+        return d is not None and bool(self.bits(c0) & d)
+
+    def __getitem__(self, cell: Coord) -> list[Coord]:
+        bits = self.bits(cell)
+        order = ORDERS[self._hash(*cell, 2) % len(ORDERS)]
+        i, j = cell
+        return [(i + OFFSETS[d][0], j + OFFSETS[d][1]) for d in order if bits & d]
+
+    def __contains__(self, cell: object) -> bool:
+        if not isinstance(cell, tuple) or len(cell) != 2:
+            return False
+        return cell[0] >= 0 and cell[1] >= 0
+
+    def minotaur_coords(self, rows: int, cols: int) -> Coord:
+        """
+        A hashed cell in [rows, 2 * rows) x [cols, 2 * cols), i.e., outside
+        of the first window of a `rows` x `cols` viewport.
+        """
+        h = self._hash(rows, cols, 3)
+        return (rows + h % rows, cols + (h >> 32) % cols)
+
+    def __repr__(self) -> str:
+        return f"HashedMaze(seed={self.seed}, accessed={len(self.cells)})"
+
+
+class MazeWindow(Mapping[Coord, list[Coord]]):
+    """
+    A `rows` x `cols` window of an unbounded maze with `origin` as its
+    top-left cell, in window coordinates. Neighbors outside of the window
+    are listed as well, such that the renderer draws openings at its edges.
+    """
+
+    def __init__(self, maze: HashedMaze, origin: Coord, rows: int, cols: int):
+        self.maze = maze
+        self.origin = origin
+        self.rows = rows
+        self.cols = cols
+
+    def to_local(self, cell: Coord) -> Coord:
+        return (cell[0] - self.origin[0], cell[1] - self.origin[1])
+
+    def to_global(self, cell: Coord) -> Coord:
+        return (cell[0] + self.origin[0], cell[1] + self.origin[1])
+
+    def __getitem__(self, cell: Coord) -> list[Coord]:
+        if cell not in self:
+            raise KeyError(cell)
+        return [self.to_local(c) for c in self.maze[self.to_global(cell)]]
+
+    def __contains__(self, cell: object) -> bool:
+        if not isinstance(cell, tuple) or len(cell) != 2:
+            return False
+        return 0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols
+
+    def __iter__(self) -> Iterator[Coord]:
+        for i in range(self.rows):
+            for j in range(self.cols):
+                yield (i, j)
+
+    def __len__(self) -> int:
+        return self.rows * self.cols
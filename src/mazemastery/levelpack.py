@@ -0,0 +1,236 @@
+"""
+Level packs: a whole curriculum of precomputed mazes in a single file.
+
+A pack starts with a header and a table with one entry per maze, followed
+by the data of every maze: its wall bits, its neighbor order and,
+optionally, the distance field towards the minotaur (see distance.py).
+The file is memory-mapped when opened, and mazes are views on the mapping,
+so opening a maze of the pack does not generate or copy anything (unless
+a modifiable copy is asked for).
+
+Usage: python -m mazemastery.levelpack PATH [--seeds 0 1 2] [--rows 10] [--cols 10]
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from mazemastery.distance import DistanceField, keep_field
+from mazemastery.grid import GridMaze, as_grid
+from mazemastery.maze import maze_factory
+from mazemastery.mazefile import FLAG_ORDER, MazeFile, MazeFileError
+from mazemastery.rng import child_rng
+from mazemastery.types import Coord
+
+MAGIC = b"MZPK"
+VERSION = 1
+
+# magic, version, header size, number of mazes. Padded to HEADER_SIZE.
+HEADER = struct.Struct("<4sHHI")
+HEADER_SIZE = 16
+
+# level, rows, cols, seed, flags, minotaur row, minotaur column, offset of
+# the cells, offset of the distance field (0 if absent).
+ENTRY = struct.Struct("<iIIqIiiQQ")
+
+FLAG_DISTANCE = 4  # The maze has a precomputed distance field
+
+# Data of every maze starts at a multiple of this, such that distances can
+# be read as 32-bit integers in place.
+ALIGNMENT = 8
+
+
+@dataclass
+class PackEntry:
+    level: int
+    rows: int
+    cols: int
+    seed: int
+    flags: int
+    minotaur_coords: Coord
+    cells_offset: int
+    distance_offset: int
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def build_pack(
+    path: str | os.PathLike,
+    levels: Iterable[tuple[int, int, int, int]],
+    engine: str = "dfs",
+    distances: bool = True,
+) -> None:
+    """
+    Generates the maze of every (level, rows, cols, seed) in `levels` and
+    writes them to a pack at `path`. Mazes are generated from the "maze"
+    stream of their seed, so they are the same as `run` creates for that
+    seed. With `distances`, the distance field towards the minotaur is
+    stored as well.
+    """
+    mazes = []
+    for level, rows, cols, seed in levels:
+        maze, minotaur_coords = maze_factory(level, rows, cols, engine, child_rng(seed, "maze"))
+        mazes.append((level, seed, as_grid(maze), minotaur_coords))
+
+    offset = _align(HEADER_SIZE + ENTRY.size * len(mazes))
+    entries = []
+    for level, seed, grid, minotaur_coords in mazes:
+        n = grid.rows * grid.cols
+        flags = FLAG_ORDER if grid.order is not None else 0
+        cells_offset = offset
+        offset = _align(offset + n * (2 if grid.order is not None else 1))
+        distance_offset = 0
+        if distances:
+            flags |= FLAG_DISTANCE
+            distance_offset = offset
+            offset = _align(offset + 5 * n)
+        entries.append(ENTRY.pack(
+            level, grid.rows, grid.cols, seed, flags, *minotaur_coords, cells_offset, distance_offset
+        ))
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, HEADER_SIZE, len(mazes)).ljust(HEADER_SIZE, b"\0"))
+        file.write(b"".join(entries))
+        for level, seed, grid, minotaur_coords in mazes:
+            file.write(b"\0" * (_align(file.tell()) - file.tell()))
+            file.write(grid.cells)
+            if grid.order is not None:
+                file.write(grid.order)
+            if distances:
+                file.write(b"\0" * (_align(file.tell()) - file.tell()))
+                field = DistanceField(grid, minotaur_coords)
+                dist = array("i", field.dist)
+                if sys.byteorder != "little":
+                    dist.byteswap()
+                file.write(dist.tobytes())
+                file.write(field.step)
+
+
+class LevelPack:
+    """
+    A memory-mapped level pack. Use `get` to open one of its mazes.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        with open(path, "rb") as file:
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._mapping
+        if len(data) < HEADER.size:
+            raise MazeFileError("File is too short to be a level pack")
+        magic, version, header_size, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise MazeFileError("Not a level pack")
+        if version > VERSION:
+            raise MazeFileError(f"Unsupported level pack version: {version}")
+        if len(data) < header_size + count * ENTRY.size:
+            raise MazeFileError("Level pack is truncated")
+        self.entries = []
+        for k in range(count):
+            level, rows, cols, seed, flags, mi, mj, cells_offset, distance_offset = ENTRY.unpack_from(
+                data, header_size + k * ENTRY.size
+            )
+            self.entries.append(PackEntry(
+                level, rows, cols, seed, flags, (mi, mj), cells_offset, distance_offset
+            ))
+        self._view = memoryview(data)
+
+    def find(self, level: int, seed: int | None = None) -> PackEntry:
+        """
+        Returns the first entry of `level` (with `seed`, if given).
+        """
+        for entry in self.entries:
+            if entry.level == level and (seed is None or entry.seed == seed):
+                return entry
+        raise KeyError((level, seed))
+
+    def get(self, level: int, seed: int | None = None, copy: bool = False) -> MazeFile:
+        """
+        Opens the maze of `level` (with `seed`, if given). The maze is a
+        read-only view on the pack, unless `copy` is set, in which case the
+        maze and its distance field are copied out of the pack, such that the
+        maze can be modified and the pack closed. Either way, the distance
+        field towards the minotaur is available through
+        `distance.distance_field` without any search.
+        """
+        entry = self.find(level, seed)
+        n = entry.rows * entry.cols
+        start = entry.cells_offset
+        end = start + n * (2 if entry.flags & FLAG_ORDER else 1)
+        if end > len(self._view):
+            raise MazeFileError("Level pack is truncated")
+        cells = self._view[start:start + n]
+        order = self._view[start + n:end] if entry.flags & FLAG_ORDER else None
+        if copy:
+            cells = bytearray(cells)
+            order = bytearray(order) if order is not None else None
+        maze = GridMaze(entry.rows, entry.cols, cells, order)
+        if entry.flags & FLAG_DISTANCE:
+            start = entry.distance_offset
+            if start + 5 * n > len(self._view):
+                raise MazeFileError("Level pack is truncated")
+            dist: array | memoryview = self._view[start:start + 4 * n].cast("i")
+            if copy or sys.byteorder != "little":
+                dist = array("i", dist.tobytes())
+                if sys.byteorder != "little":
+                    dist.byteswap()
+            step: bytearray | memoryview = self._view[start + 4 * n:start + 5 * n]
+            if copy:
+                step = bytearray(step)
+            keep_field(DistanceField(maze, entry.minotaur_coords, dist, step))
+        return MazeFile(maze, entry.level, entry.seed, entry.minotaur_coords)
+
+    def close(self) -> None:
+        self._view.release()
+        try:
+            self._mapping.close()
+        except BufferError:
+            # Mazes of the pack are still in use. The file is unmapped once
+            # they are garbage collected.
+            pass
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __enter__(self) -> "LevelPack":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def curriculum(
+    seeds: Iterable[int], rows: int = 10, cols: int = 10, levels: Iterable[int] = range(1, 9)
+) -> list[tuple[int, int, int, int]]:
+    """
+    The (level, rows, cols, seed) of every level for every seed, e.g., for
+    `build_pack`.
+    """
+    levels = list(levels)
+    return [(level, rows, cols, seed) for seed in seeds for level in levels]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Builds a level pack of levels 1-8.")
+    parser.add_argument("path")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--engine", default="dfs")
+    parser.add_argument("--no-distances", action="store_true")
+    args = parser.parse_args()
+    build_pack(
+        args.path,
+        curriculum(args.seeds, args.rows, args.cols),
+        args.engine,
+        not args.no_distances,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,52 @@
 import math
 import random
+import time
+import tracemalloc
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, TypeVar
 
-from mazemastery.types import Coord, Maze
+from mazemastery.rng import resolve
+from mazemastery.grid import DIRECTIONS, E, N, OFFSETS, OPPOSITE, S, W, GridMaze, are_connected
+from mazemastery.types import AnyMaze, Coord, Maze
+from mazemastery.validate import check_maze, validation_enabled
 
+if TYPE_CHECKING:
+    from mazemastery.difficulty import Target
 
-def randomize_neighbor_order(maze: Maze) -> Maze:
+MazeT = TypeVar("MazeT", Maze, GridMaze)
+
+# Bump whenever a change to the generators changes the maze that is created
+# for a given seed. Cached mazes of older versions are then ignored.
+GENERATOR_VERSION = 2
+
+
+def randomize_neighbor_order(maze: MazeT, rng: random.Random | None = None) -> MazeT:
     """
     Randomizes the order of neighbors of each cell in the maze to
     avoid users relying on a specific order.
     """
+    rng = resolve(rng)
+    if isinstance(maze, GridMaze):
+        maze.shuffle_neighbors(rng)
+        return maze
     for node, neighbors in maze.items():
-        random.shuffle(neighbors)
+        rng.shuffle(neighbors)
         maze[node] = neighbors
     return maze
 
 
-def get_maze_size(maze: Maze) -> tuple[int, int]:
+def get_maze_size(maze: AnyMaze) -> tuple[int, int]:
+    if isinstance(maze, GridMaze):
+        return maze.rows, maze.cols
     m = max(i for i, _ in maze.keys()) + 1  # Number of rows
     n = max(j for _, j in maze.keys()) + 1  # Number of columns
     return m, n
 
 
-def create_corridor(length: int, dir: str = "horizontal") -> Maze:
+def create_corridor(
+    length: int, dir: str = "horizontal", rng: random.Random | None = None
+) -> Maze:
     """
     Generates a maze of length `length` that is a single horizontal/vertical
     path.
@@ -39,7 +64,7 @@ def create_corridor(length: int, dir: str = "horizontal") -> Maze:
         maze[(length - 1, 0)] = [(length - 2, 0)]
     else:
         raise ValueError(f"Invalid direction: {dir}")
-    maze = randomize_neighbor_order(maze)
+    maze = randomize_neighbor_order(maze, rng)
     return maze
 
 
@@ -79,48 +104,68 @@ def create_zigzag(length) -> tuple[Maze, Coord]:
     return maze, (i, j)
 
 
-def create_SAW(rows: int, cols: int, temp: float = 0.01) -> tuple[Maze, list[Coord]]:
+def create_SAW(
+    rows: int, cols: int, temp: float = 0.01, rng: random.Random | None = None
+) -> tuple[GridMaze, list[Coord]]:
     """
     Generates a maze of size `rows` x `cols` that contains a self-avoiding walk.
+
+    At every step, the walk prefers the directions with fewer visited cells.
+    Instead of recounting the path on every step, we keep the number of
+    visited cells per row and column and the number of visited cells above
+    and to the left of the current position, such that each step is O(1).
     """
+    rng = resolve(rng)
+    visited = bytearray(rows * cols)
+    row_counts = [0] * rows
+    col_counts = [0] * cols
+    above = 0  # Visited cells in rows above the current position
+    left = 0  # Visited cells in columns left of the current position
+    total = 0
     path = []
-    pos = (0, 0)
+    i, j = 0, 0
     offsets = [(-1, 0), (0, -1), (0, 1), (1, 0)]
     while True:
-        if pos not in path:
-            path.append(pos)
-        i, j = pos
-
-        # Count number of unvisited cells for each of the possible directions
-        num_unvisited = [0, 0, 0, 0]
-        for ii, jj in path:
-            if ii < i:
-                num_unvisited[0] += 1
-            if ii > i:
-                num_unvisited[3] += 1
-            if jj < j:
-                num_unvisited[1] += 1
-            if jj > j:
-                num_unvisited[2] += 1
-        potential_neighbors = [(i + di, j + dj) for di, dj in offsets]
-        neighbors_counts = [
-            (n, z)
-            for (n, z) in zip(potential_neighbors, num_unvisited)
-            if n[0] >= 0 and n[0] < rows and n[1] >= 0 and n[1] < cols
+        path.append((i, j))
+        visited[i * cols + j] = 1
+        row_counts[i] += 1
+        col_counts[j] += 1
+        total += 1
+
+        # Number of visited cells for each of the possible directions
+        num_visited = [
+            above,
+            left,
+            total - left - col_counts[j],
+            total - above - row_counts[i],
         ]
-        neighbors_counts = [(n, z) for (n, z) in neighbors_counts if n not in path]
-        if len(neighbors_counts) == 0:
+        neighbors = []
+        counts = []
+        for (di, dj), z in zip(offsets, num_visited):
+            ii, jj = i + di, j + dj
+            if 0 <= ii < rows and 0 <= jj < cols and not visited[ii * cols + jj]:
+                neighbors.append((ii, jj))
+                counts.append(z)
+        if len(neighbors) == 0:
             break
-        neighbors = [n for (n, _) in neighbors_counts]
-        counts = [z for (_, z) in neighbors_counts]
         probs = softmax(counts, temp=-temp)
-        pos = weighted_choice(neighbors, probs)
-    maze: Maze = {(i, j): [] for i in range(rows) for j in range(cols)}
-    for i in range(1, len(path) - 1):
-        maze[path[i]] = [path[i - 1], path[i + 1]]
-    maze[path[0]] = [path[1]]
-    maze[path[-1]] = [path[-2]]
-    maze = randomize_neighbor_order(maze)
+        ii, jj = weighted_choice(neighbors, probs, rng)
+
+        # Moving across a row (column) moves its cells to the other side.
+        if ii < i:
+            above -= row_counts[ii]
+        elif ii > i:
+            above += row_counts[i]
+        elif jj < j:
+            left -= col_counts[jj]
+        else:
+            left += col_counts[j]
+        i, j = ii, jj
+
+    maze = GridMaze(rows, cols)
+    for k in range(1, len(path)):
+        maze.open_wall(path[k - 1], path[k])
+    maze = randomize_neighbor_order(maze, rng)
     return maze, path
 
 
@@ -135,11 +180,13 @@ def softmax(vals: list[int], temp: float = 0.5) -> list[float]:
     return [v / (sum_exp_vals) for v in exp_vals]
 
 
-def weighted_choice(choices: list[Coord], probs: list[float]) -> Coord: # Could be made generic
+def weighted_choice(
+    choices: list[Coord], probs: list[float], rng: random.Random | None = None
+) -> Coord: # Could be made generic
     """
     Chooses a random element from `choices` with probabilities `probs`.
     """
-    r = random.uniform(0, 1)
+    r = resolve(rng).uniform(0, 1)
     total = 0.0
     for c, p in zip(choices, probs):
         total += p
@@ -148,20 +195,20 @@ def weighted_choice(choices: list[Coord], probs: list[float]) -> Coord: # Could
     return choices[-1]
 
 
-def count_neighbors_in_2x2_subgraph(maze: Maze, bi: int, bj: int) -> int:
+def count_neighbors_in_2x2_subgraph(maze: AnyMaze, bi: int, bj: int) -> int:
     """
     Count number of neighbors within 2x2 subgraph whose North-West cell
     is (bi, bj).
     """
     count = 0
-    count += (bi, bj + 1) in maze[(bi, bj)]  # East of North-West
-    count += (bi + 1, bj) in maze[(bi, bj)]  # South of North-West
-    count += (bi, bj + 1) in maze[(bi + 1, bj + 1)]  # North of South-East
-    count += (bi + 1, bj) in maze[(bi + 1, bj + 1)]  # West of South-East cell
+    count += are_connected(maze, (bi, bj), (bi, bj + 1))  # East of North-West
+    count += are_connected(maze, (bi, bj), (bi + 1, bj))  # South of North-West
+    count += are_connected(maze, (bi + 1, bj + 1), (bi, bj + 1))  # North of South-East
+    count += are_connected(maze, (bi + 1, bj + 1), (bi + 1, bj))  # West of South-East cell
     return count
 
 
-def creates_2x2_hole(maze: Maze, c0: Coord, c1: Coord) -> bool:
+def creates_2x2_hole(maze: AnyMaze, c0: Coord, c1: Coord) -> bool:
     """
     Check if the removal of the wall between neighbor1 and neighbor2 creates a
     empty space of size at least 2x2 or larger.
@@ -198,99 +245,375 @@ def creates_2x2_hole(maze: Maze, c0: Coord, c1: Coord) -> bool:
     return False
 
 
-def create_maze(rows: int, cols: int, start: Coord, p_remove: float = 0.9) -> Maze:
+# Translation table that keeps only the wall bits of a cell.
+_WALL_BITS = bytes(b & 15 for b in range(256))
+
+
+def carve_dfs(
+    rows: int, cols: int, start: Coord, rng: random.Random | None = None
+) -> GridMaze:
+    """
+    Performs randomized depth-first search to create a perfect maze (i.e., a
+    maze without loops). Produces long corridors with few branches.
+
+    Runs in O(rows * cols) time. Instead of keeping a stack, every visited cell
+    stores the direction back to the cell it was reached from, so the search
+    backtracks along the maze itself. Cells with open walls are the visited
+    ones, so the direction is all there is to store: two bits per cell, kept
+    in the unused upper bits of the cells themselves until the maze is done.
+    """
+    maze = GridMaze(rows, cols)
+    cells = maze.cells
+    step = {N: -cols, W: -1, E: 1, S: cols}
+
+    # Row, column and index offset of each direction, and the bits to set on
+    # the cell moved to: the wall back and the index of the direction back
+    # into DIRECTIONS, shifted above the wall bits.
+    moves = {
+        d: (*OFFSETS[d], step[d], OPPOSITE[d] | DIRECTIONS.index(OPPOSITE[d]) << 4)
+        for d in DIRECTIONS
+    }
+    backtracks = [moves[d] for d in DIRECTIONS]
+
+    i, j = start
+    current = root = maze.index(start)
+    choice = resolve(rng).choice
+    while True:
+        # Cells are visited once they have an open wall. The start has none
+        # until the first step, but is only a candidate after that.
+        candidates = []
+        if i > 0 and not cells[current - cols]:
+            candidates.append(N)
+        if j > 0 and not cells[current - 1]:
+            candidates.append(W)
+        if j < cols - 1 and not cells[current + 1]:
+            candidates.append(E)
+        if i < rows - 1 and not cells[current + cols]:
+            candidates.append(S)
+        if candidates:
+            d = choice(candidates)
+            di, dj, dk, back = moves[d]
+            cells[current] |= d
+            cells[current + dk] |= back
+        else:
+            # Dead end, backtrack to the parent.
+            if current == root:
+                break
+            di, dj, dk, _ = backtracks[cells[current] >> 4]
+        i += di
+        j += dj
+        current += dk
+
+    # Clear the directions to the parents, in chunks to stay within O(1)
+    # additional memory.
+    chunk = 1 << 12
+    for k in range(0, len(cells), chunk):
+        cells[k:k + chunk] = cells[k:k + chunk].translate(_WALL_BITS)
+    return maze
+
+
+def carve_kruskal(
+    rows: int, cols: int, start: Coord, rng: random.Random | None = None
+) -> GridMaze:
     """
-    Performs randomized depth-first search to create a maze.
+    Uses randomized Kruskal to create a perfect maze. Walls are visited in
+    random order and removed if they separate two cells that are not yet
+    connected. Produces many short dead ends.
+
+    Connectivity is tracked with a union-find on cell indices (path halving,
+    union by rank), stored in arrays of machine integers. The start cell is
+    irrelevant for this algorithm.
     """
+    maze = GridMaze(rows, cols)
+    cells = maze.cells
+    n = rows * cols
+
+    # The east wall of cell k is numbered 2 * k, the south wall 2 * k + 1.
+    walls = array("i", (2 * k for k in range(n) if (k + 1) % cols))
+    walls.extend(2 * k + 1 for k in range(n - cols))
+    resolve(rng).shuffle(walls)
+
+    parent = array("i", range(n))
+    rank = bytearray(n)
+    remaining = n - 1
+    for wall in walls:
+        if remaining == 0:
+            break
+        k0 = wall >> 1
+        k1 = k0 + cols if wall & 1 else k0 + 1
+
+        # Find the roots of both cells, halving the paths along the way.
+        a = k0
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        b = k1
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a == b:
+            continue
 
-    # The maze graph is represented as a dictionary of sets.
-    # A node is a 2-tupel (i, j) representing the row and column of a cell.
-    # The list of neighbors of a node is the set of nodes that can be reached
-    # from the node.
-    maze: Maze = {(i, j): [] for i in range(rows) for j in range(cols)}
-    prev: dict[Coord, Coord | None] = {(i, j): None for i in range(rows) for j in range(cols)}
-    stack = [start]
-    visited = set()
-    offsets = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+        if rank[a] < rank[b]:
+            a, b = b, a
+        parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        if wall & 1:
+            cells[k0] |= S
+            cells[k1] |= N
+        else:
+            cells[k0] |= E
+            cells[k1] |= W
+        remaining -= 1
+    return maze
 
-    while len(stack) > 0:
-        current = stack.pop()
-        prev_current = prev[current]
-        if prev_current:
-            if prev_current not in current:
-                maze[current].append(prev_current)
-                maze[prev_current].append(current)
-        visited.add(current)
-        i, j = current
-        neighbors = [(i + di, j + dj) for di, dj in offsets]
-        neighbors = [n for n in neighbors if n in maze and n not in visited]
-        if len(neighbors) == 0:
+
+def carve_wilson(
+    rows: int, cols: int, start: Coord, rng: random.Random | None = None
+) -> GridMaze:
+    """
+    Uses Wilson's algorithm to create a perfect maze that is drawn uniformly
+    at random from all spanning trees of the grid. Starting with the tree
+    {start}, we repeatedly perform a random walk from a cell outside of the
+    tree until it hits the tree, and add the walk without its loops.
+
+    Slower than the other engines, since the first walks wander for a long
+    time before hitting the tree, but has no directional bias.
+    """
+    maze = GridMaze(rows, cols)
+    cells = maze.cells
+    n = rows * cols
+    step = {N: -cols, W: -1, E: 1, S: cols}
+    moves = [(d, *OFFSETS[d], step[d]) for d in DIRECTIONS]
+
+    in_tree = bytearray(n)
+    in_tree[maze.index(start)] = 1
+
+    # Direction in which the current walk last left each cell. When the walk
+    # returns to a cell, this is overwritten, which erases the loop.
+    exits = bytearray(n)
+    rand = resolve(rng).random
+    for k0 in range(n):
+        if in_tree[k0]:
             continue
-        random.shuffle(neighbors)
-        for neighbor in neighbors:
-            prev[neighbor] = current
-            stack.append(neighbor)
+        k = k0
+        i, j = divmod(k0, cols)
+        while not in_tree[k]:
+            # Choosing uniformly and rejecting moves leaving the grid is the
+            # same as choosing uniformly among the valid moves.
+            d, di, dj, dk = moves[int(rand() * 4)]
+            if not (0 <= i + di < rows and 0 <= j + dj < cols):
+                continue
+            exits[k] = d
+            i += di
+            j += dj
+            k += dk
+
+        # Retrace the loop-erased walk and add it to the tree.
+        k = k0
+        while not in_tree[k]:
+            d = exits[k]
+            in_tree[k] = 1
+            cells[k] |= d
+            k += step[d]
+            cells[k] |= OPPOSITE[d]
+    return maze
+
 
+def remove_walls(maze: GridMaze, p_remove: float, rng: random.Random | None = None) -> None:
+    """
+    Removes each wall of inner cells with probability `p_remove`, unless this
+    would open up an empty space of size 2x2 or larger. Walls between two
+    inner cells are considered from both sides.
+    """
+    if p_remove <= 0:
+        return
+    rows, cols = maze.rows, maze.cols
+    cells = maze.cells
+    step = {N: -cols, W: -1, E: 1, S: cols}
+
+    # North-west cells of the two 2x2 blocks sharing a wall, relative to the
+    # cell on this side of the wall.
+    blocks = {
+        N: (-cols - 1, -cols),
+        W: (-cols - 1, -1),
+        E: (-cols, 0),
+        S: (-1, 0),
+    }
+    rand = resolve(rng).random
     for i in range(1, rows - 1):
         for j in range(1, cols - 1):
-            all_neighbors = [(i + di, j + dj) for di, dj in offsets]
-            walls = [n for n in all_neighbors if n not in maze[(i, j)]]
-            for wall in walls:
-                if creates_2x2_hole(maze, (i, j), wall):
+            k = i * cols + j
+            for d in DIRECTIONS:
+                # The coin is independent of the wall, so we can flip it
+                # first and skip the hole check for most walls.
+                if cells[k] & d or rand() > p_remove:
                     continue
-                if random.random() <= p_remove:
-                    # Remove wall (by connecting neighbors)
-                    maze[(i, j)].append(wall)
-                    maze[wall].append((i, j))
+                for b in blocks[d]:
+                    b += k
+                    if (
+                        (cells[b] & E > 0)
+                        + (cells[b] & S > 0)
+                        + (cells[b + 1] & S > 0)
+                        + (cells[b + cols] & E > 0)
+                    ) == 3:
+                        # Removing this wall would create a hole.
+                        break
+                else:
+                    cells[k] |= d
+                    cells[k + step[d]] |= OPPOSITE[d]
+
+
+def carve_sidewinder(
+    rows: int, cols: int, start: Coord, rng: random.Random | None = None
+) -> GridMaze:
+    """
+    Creates a perfect maze with NumPy array operations (see vectorized.py).
+    Much faster than the other engines on large grids, at the cost of a
+    visible bias: the top row is a single corridor. Requires NumPy.
+    """
+    from mazemastery.vectorized import sidewinder
+
+    return sidewinder(rows, cols, rng)
 
-    for node, neighbors in maze.items():
-        maze[node] = list(set(neighbors))
 
-    maze = randomize_neighbor_order(maze)
+# Engines that create perfect mazes for levels 6-8, selectable by name.
+ENGINES: dict[str, Callable[[int, int, Coord, random.Random | None], GridMaze]] = {
+    "dfs": carve_dfs,
+    "kruskal": carve_kruskal,
+    "wilson": carve_wilson,
+    "sidewinder": carve_sidewinder,
+}
 
+
+def create_maze(
+    rows: int,
+    cols: int,
+    start: Coord,
+    p_remove: float = 0.9,
+    engine: str = "dfs",
+    rng: random.Random | None = None,
+) -> GridMaze:
+    """
+    Creates a perfect maze with the given engine (see `ENGINES`) and then
+    adds loops by removing walls with probability `p_remove`.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Invalid engine: {engine}")
+    rng = resolve(rng)
+    maze = ENGINES[engine](rows, cols, start, rng)
+    if engine == "sidewinder":
+        from mazemastery.vectorized import remove_walls_vectorized
+
+        remove_walls_vectorized(maze, p_remove, rng)
+    else:
+        remove_walls(maze, p_remove, rng)
+    maze = randomize_neighbor_order(maze, rng)
     return maze
 
 
-def maze_factory(level: int, rows: int, cols: int) -> tuple[Maze, Coord]:
-    match level:
-        case 1:
-            maze = create_corridor(cols, "horizontal")
-            minotaur_coords = (0, cols - 1)
-        case 2:
-            maze = create_corridor(cols, "horizontal")
-            minotaur_coords = (0, random.choice(range(1, cols - 1)))
-        case 3:
-            maze = create_corridor(rows, "vertical")
-            minotaur_coords = (random.choice(range(1, rows - 1)), 0)
-        case 4:
-            maze, minotaur_coords = create_zigzag(cols)
-        case 5:
-            maze, path = create_SAW(rows, cols)
-            minotaur_coords = path[-1]
-        case 6:
-            maze = create_maze(rows, cols, (0, 0), 0.0)
-
-            # Choose coordinates in the bottom-right quadrant
-            minotaur_coords = (
-                random.choice(range(rows // 2, rows)),
-                random.choice(range(cols // 2, cols))
-            )
-        case 7:
-            maze = create_maze(rows, cols, (0, 0), 0.2)
-            # Choose coordinates in the bottom-right quadrant
-            minotaur_coords = (
-                random.choice(range(rows // 2, rows)),
-                random.choice(range(cols // 2, cols))
-            )
-        case 8:
-            maze = create_maze(rows, cols, (0, 0), 0.2)
-            # Choose coordinates in the bottom-right quadrant
-            minotaur_coords = (
-                random.choice(range(rows // 2, rows)),
-                random.choice(range(cols // 2, cols))
-            )
-        case _:
-            raise ValueError(f"Invalid level: {level}")
+@dataclass
+class EngineReport:
+    engine: str
+    rows: int
+    cols: int
+    seconds: float
+    peak_bytes: int
+
+
+def profile_engine(
+    engine: str,
+    rows: int,
+    cols: int,
+    p_remove: float = 0.2,
+    seed: int | None = 0,
+) -> EngineReport:
+    """
+    Measures the time and peak memory it takes `create_maze` to build a maze
+    with the given engine. Memory is traced in a second run with the same
+    seed, since tracing slows down the allocations considerably.
+    """
+    start = time.perf_counter()
+    create_maze(rows, cols, (0, 0), p_remove, engine, random.Random(seed))
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        create_maze(rows, cols, (0, 0), p_remove, engine, random.Random(seed))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return EngineReport(engine, rows, cols, seconds, peak)
+
+
+def maze_factory(
+    level: int,
+    rows: int,
+    cols: int,
+    engine: str = "dfs",
+    rng: random.Random | None = None,
+    target: "Target | None" = None,
+    workers: int | None = 1,
+) -> tuple[AnyMaze, Coord]:
+    """
+    Creates the maze of the given level and the position of the minotaur.
+    `engine` selects the generator used for levels 6-8 (see `ENGINES`).
+    For these levels, a `target` difficulty can be given, in which case
+    mazes are sampled on `workers` processes until one meets it (see
+    `difficulty.find_maze`, which also reports the number of tried
+    candidates).
+    Set the environment variable MAZEMASTERY_VALIDATE to check every maze
+    (see validate.py).
+    """
+    rng = resolve(rng)
+    if target is not None:
+        from mazemastery.difficulty import find_maze
+
+        found = find_maze(level, rows, cols, target, rng.getrandbits(63), engine, workers)
+        maze, minotaur_coords = found.maze, found.minotaur_coords
+    else:
+        match level:
+            case 1:
+                maze = create_corridor(cols, "horizontal", rng)
+                minotaur_coords = (0, cols - 1)
+            case 2:
+                maze = create_corridor(cols, "horizontal", rng)
+                minotaur_coords = (0, rng.choice(range(1, cols - 1)))
+            case 3:
+                maze = create_corridor(rows, "vertical", rng)
+                minotaur_coords = (rng.choice(range(1, rows - 1)), 0)
+            case 4:
+                maze, minotaur_coords = create_zigzag(cols)
+            case 5:
+                maze, path = create_SAW(rows, cols, rng=rng)
+                minotaur_coords = path[-1]
+            case 6:
+                maze = create_maze(rows, cols, (0, 0), 0.0, engine, rng)
+
+                # Choose coordinates in the bottom-right quadrant
+                minotaur_coords = (
+                    rng.choice(range(rows // 2, rows)),
+                    rng.choice(range(cols // 2, cols))
+                )
+            case 7:
+                maze = create_maze(rows, cols, (0, 0), 0.2, engine, rng)
+                # Choose coordinates in the bottom-right quadrant
+                minotaur_coords = (
+                    rng.choice(range(rows // 2, rows)),
+                    rng.choice(range(cols // 2, cols))
+                )
+            case 8:
+                maze = create_maze(rows, cols, (0, 0), 0.2, engine, rng)
+                # Choose coordinates in the bottom-right quadrant
+                minotaur_coords = (
+                    rng.choice(range(rows // 2, rows)),
+                    rng.choice(range(cols // 2, cols))
+                )
+            case _:
+                raise ValueError(f"Invalid level: {level}")
+    if validation_enabled():
+        check_maze(maze, (0, 0), minotaur_coords)
     return maze, minotaur_coords
 
 
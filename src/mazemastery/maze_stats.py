@@ -0,0 +1,190 @@
+"""
+Statistics over many mazes at once, e.g., to calibrate the difficulty of a
+level on a generated corpus.
+
+Mazes of the same size are packed into a single (mazes, rows, cols) array
+of wall bits (see grid.py) and all statistics are computed with NumPy
+operations on the whole batch. The only Python loop is over the BFS layers
+of the solution search. Requires NumPy (`pip install mazemastery[stats]`).
+"""
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError("maze_stats requires NumPy: pip install mazemastery[stats]") from e
+
+from mazemastery.grid import E, N, S, W, as_grid
+from mazemastery.types import AnyMaze, Coord
+
+_DEGREE = np.array([bin(bits).count("1") for bits in range(16)], dtype=np.uint8)
+
+
+@dataclass
+class MazeStats:
+    """
+    Statistics of a batch of mazes of the same size. Every array has one
+    entry (or row) per maze.
+    """
+
+    rows: int
+    cols: int
+    # Number of cells with exactly one opening.
+    dead_ends: np.ndarray
+    # Number of cells with 0, 1, 2, 3 and 4 openings.
+    degree_hist: np.ndarray
+    # Number of straight corridors of each length in cells. A corridor is a
+    # maximal row or column segment of cells connected in a straight line,
+    # so every passage is part of exactly one horizontal or vertical one.
+    corridor_hist: np.ndarray
+    # Number of independent loops among the cells reachable from the start,
+    # i.e., passages - cells + 1. Zero for a perfect maze.
+    loops: np.ndarray
+    # Length of the shortest path from the start to the target, -1 if the
+    # target cannot be reached.
+    solution_length: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dead_ends)
+
+    @classmethod
+    def concat(cls, stats: Sequence["MazeStats"]) -> "MazeStats":
+        """Joins the statistics of batches of mazes of the same size."""
+        return cls(
+            stats[0].rows,
+            stats[0].cols,
+            np.concatenate([s.dead_ends for s in stats]),
+            np.concatenate([s.degree_hist for s in stats]),
+            np.concatenate([s.corridor_hist for s in stats]),
+            np.concatenate([s.loops for s in stats]),
+            np.concatenate([s.solution_length for s in stats]),
+        )
+
+
+def pack(mazes: Iterable[AnyMaze]) -> np.ndarray:
+    """
+    Stacks the wall bits of mazes of the same size into a (mazes, rows,
+    cols) array.
+    """
+    grids = [as_grid(maze) for maze in mazes]
+    if not grids:
+        raise ValueError("No mazes to pack")
+    rows, cols = grids[0].rows, grids[0].cols
+    if any((g.rows, g.cols) != (rows, cols) for g in grids):
+        raise ValueError("All mazes must have the same size")
+    data = b"".join(bytes(g.cells) for g in grids)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(grids), rows, cols)
+
+
+def _run_lengths(open_: np.ndarray, max_len: int) -> np.ndarray:
+    """
+    Histogram of the lengths (in cells) of the runs of open passages along
+    the last axis of a (mazes, lines, passages) array. A run of k passages
+    spans k + 1 cells, so lengths 0 and 1 never occur.
+    """
+    b = open_.shape[0]
+    padded = np.zeros(open_.shape[:2] + (open_.shape[2] + 2,), dtype=np.int8)
+    padded[:, :, 1:-1] = open_
+    edges = np.diff(padded, axis=2)
+    mazes, _, starts = np.nonzero(edges == 1)
+    _, _, ends = np.nonzero(edges == -1)
+    # Starts and ends are both in row-major order, so they pair up.
+    lengths = ends - starts + 1
+    hist = np.bincount(mazes * (max_len + 1) + lengths, minlength=b * (max_len + 1))
+    return hist.reshape(b, max_len + 1)
+
+
+def cell_stats(
+    cells: np.ndarray, targets: Sequence[Coord], start: Coord = (0, 0)
+) -> MazeStats:
+    """
+    Computes the statistics of packed mazes (see `pack`). `targets` holds
+    the target of each maze, e.g., its minotaur coordinates.
+    """
+    b, rows, cols = cells.shape
+    degree = _DEGREE[cells & 15]
+    degree_hist = np.stack([(degree == k).sum(axis=(1, 2), dtype=np.int64) for k in range(5)], axis=1)
+
+    max_len = max(rows, cols)
+    corridor_hist = _run_lengths((cells[:, :, :-1] & E) != 0, max_len)
+    corridor_hist += _run_lengths((cells[:, :-1, :] & S).transpose(0, 2, 1) != 0, max_len)
+
+    # Breadth-first search on all mazes at once, one layer per iteration.
+    open_n = (cells & N) != 0
+    open_w = (cells & W) != 0
+    open_e = (cells & E) != 0
+    open_s = (cells & S) != 0
+    reached = np.zeros(cells.shape, dtype=bool)
+    reached[:, start[0], start[1]] = True
+    frontier = reached.copy()
+    targets_ = np.asarray(targets).reshape(b, 2)
+    index = np.arange(b)
+    solution_length = np.full(b, -1, dtype=np.int64)
+    solution_length[reached[index, targets_[:, 0], targets_[:, 1]]] = 0
+    layer = 0
+    while frontier.any():
+        layer += 1
+        grown = np.zeros_like(frontier)
+        grown[:, :-1, :] |= frontier[:, 1:, :] & open_n[:, 1:, :]
+        grown[:, 1:, :] |= frontier[:, :-1, :] & open_s[:, :-1, :]
+        grown[:, :, :-1] |= frontier[:, :, 1:] & open_w[:, :, 1:]
+        grown[:, :, 1:] |= frontier[:, :, :-1] & open_e[:, :, :-1]
+        frontier = grown & ~reached
+        reached |= frontier
+        found = frontier[index, targets_[:, 0], targets_[:, 1]]
+        solution_length[found] = layer
+
+    # Every passage is counted at both of its cells.
+    passages = np.where(reached, degree, 0).sum(axis=(1, 2), dtype=np.int64) // 2
+    loops = passages - reached.sum(axis=(1, 2), dtype=np.int64) + 1
+
+    return MazeStats(
+        rows,
+        cols,
+        degree_hist[:, 1].copy(),
+        degree_hist,
+        corridor_hist,
+        loops,
+        solution_length,
+    )
+
+
+def maze_stats(
+    mazes: Sequence[AnyMaze], targets: Sequence[Coord], start: Coord = (0, 0)
+) -> MazeStats:
+    """
+    Computes the statistics of mazes of the same size, with `targets`
+    holding the target of each maze.
+    """
+    return cell_stats(pack(mazes), targets, start)
+
+
+def corpus_stats(
+    corpus: Iterable[tuple[AnyMaze, Coord]],
+    start: Coord = (0, 0),
+    chunksize: int = 1024,
+) -> dict[tuple[int, int], MazeStats]:
+    """
+    Computes the statistics of a corpus of (maze, target) pairs, e.g., the
+    output of `maze_factory` or the `maze` and `minotaur_coords` of
+    `batch.generate_batch`. Mazes are grouped by size and evaluated in
+    batches of `chunksize` to bound the memory.
+    """
+    pending: dict[tuple[int, int], list[tuple[AnyMaze, Coord]]] = {}
+    done: dict[tuple[int, int], list[MazeStats]] = {}
+
+    def flush(size: tuple[int, int]) -> None:
+        chunk = pending.pop(size)
+        stats = maze_stats([m for m, _ in chunk], [t for _, t in chunk], start)
+        done.setdefault(size, []).append(stats)
+
+    for maze, target in corpus:
+        grid = as_grid(maze)
+        size = (grid.rows, grid.cols)
+        pending.setdefault(size, []).append((grid, target))
+        if len(pending[size]) >= chunksize:
+            flush(size)
+    for size in list(pending):
+        flush(size)
+    return {size: MazeStats.concat(stats) for size, stats in done.items()}
@@ -0,0 +1,212 @@
+"""
+Binary maze files.
+
+A maze file starts with a fixed-size header, followed by the wall bits of
+every cell in row-major order (one byte per cell, see grid.py) and,
+optionally, the neighbor order of every cell. Since this is exactly the
+layout of `GridMaze`, a loaded maze is a view on the memory-mapped file:
+opening a file is O(1) and cells are only read from disk when accessed.
+"""
+import mmap
+import os
+import struct
+from collections.abc import Iterable
+
+from mazemastery.grid import GridMaze, as_grid
+from mazemastery.types import AnyMaze, Coord
+
+MAGIC = b"MZMS"
+VERSION = 1
+
+# magic, version, header size, flags, rows, cols, level, seed,
+# minotaur row, minotaur column. The header is padded to HEADER_SIZE bytes.
+HEADER = struct.Struct("<4sHHIIIiqii")
+HEADER_SIZE = 64
+
+FLAG_SEED = 1  # The seed field is valid
+FLAG_ORDER = 2  # The cells are followed by the neighbor orders
+
+
+class MazeFileError(ValueError):
+    pass
+
+
+class MazeFile:
+    """
+    A maze loaded from a file together with its metadata. The maze is a
+    read-only view on the file; use `maze.copy()` to modify it.
+    """
+
+    def __init__(
+        self,
+        maze: GridMaze,
+        level: int,
+        seed: int | None,
+        minotaur_coords: Coord,
+        mapping: mmap.mmap | None = None,
+    ):
+        self.maze = maze
+        self.level = level
+        self.seed = seed
+        self.minotaur_coords = minotaur_coords
+        self._mapping = mapping
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            cells, order = self.maze.cells, self.maze.order
+            if isinstance(cells, memoryview):
+                cells.release()
+            if isinstance(order, memoryview):
+                order.release()
+            try:
+                self._mapping.close()
+            except BufferError:
+                # Slices of the cells are still in use elsewhere. The file is
+                # unmapped once they are garbage collected.
+                pass
+            self._mapping = None
+
+    def __enter__(self) -> "MazeFile":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def pack_header(
+    rows: int,
+    cols: int,
+    level: int,
+    seed: int | None,
+    minotaur_coords: Coord,
+    flags: int = 0,
+) -> bytes:
+    if seed is not None:
+        flags |= FLAG_SEED
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        HEADER_SIZE,
+        flags,
+        rows,
+        cols,
+        level,
+        seed if seed is not None else 0,
+        *minotaur_coords,
+    )
+    return header.ljust(HEADER_SIZE, b"\0")
+
+
+def unpack_header(data: bytes) -> tuple[int, int, int, int, int, int | None, Coord]:
+    """
+    Returns the header size, flags, rows, cols, level, seed and minotaur
+    coordinates.
+    """
+    if len(data) < HEADER.size:
+        raise MazeFileError("File is too short to be a maze file")
+    magic, version, header_size, flags, rows, cols, level, seed, mi, mj = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise MazeFileError("Not a maze file")
+    if version > VERSION:
+        raise MazeFileError(f"Unsupported maze file version: {version}")
+    return header_size, flags, rows, cols, level, seed if flags & FLAG_SEED else None, (mi, mj)
+
+
+def save_maze(
+    path: str | os.PathLike,
+    maze: AnyMaze,
+    level: int = 0,
+    seed: int | None = None,
+    minotaur_coords: Coord = (0, 0),
+) -> None:
+    """
+    Writes `maze` and its metadata to `path`.
+    """
+    grid = as_grid(maze)
+    flags = FLAG_ORDER if grid.order is not None else 0
+    with open(path, "wb") as file:
+        file.write(pack_header(grid.rows, grid.cols, level, seed, minotaur_coords, flags))
+        file.write(grid.cells)
+        if grid.order is not None:
+            file.write(grid.order)
+
+
+def save_rows(
+    path: str | os.PathLike,
+    rows: int,
+    cols: int,
+    cells: Iterable[bytearray],
+    level: int = 0,
+    seed: int | None = None,
+    minotaur_coords: Coord = (0, 0),
+) -> None:
+    """
+    Writes a maze given as an iterable of rows (e.g., from
+    `stream.eller_rows`) to `path` without holding it in memory.
+    """
+    with MazeWriter(path, rows, cols, level, seed, minotaur_coords) as writer:
+        for i, row in enumerate(cells):
+            writer(i, row)
+
+
+class MazeWriter:
+    """
+    Writes a maze file row by row. Can be used as a sink for
+    `stream.stream_to`.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        rows: int,
+        cols: int,
+        level: int = 0,
+        seed: int | None = None,
+        minotaur_coords: Coord = (0, 0),
+    ):
+        self.rows = rows
+        self.cols = cols
+        self.written = 0
+        self.file = open(path, "wb")
+        self.file.write(pack_header(rows, cols, level, seed, minotaur_coords))
+
+    def __call__(self, i: int, row: bytearray) -> None:
+        if i != self.written or len(row) != self.cols:
+            raise MazeFileError(f"Expected row {self.written} with {self.cols} cells")
+        self.file.write(row)
+        self.written += 1
+
+    def close(self) -> None:
+        self.file.close()
+        if self.written != self.rows:
+            raise MazeFileError(f"Expected {self.rows} rows, got {self.written}")
+
+    def __enter__(self) -> "MazeWriter":
+        return self
+
+    def __exit__(self, exc_type: object, *args: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+
+def load_maze(path: str | os.PathLike) -> MazeFile:
+    """
+    Memory-maps the maze file at `path`. Nothing but the header is read
+    until cells are accessed.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        header_size, flags, rows, cols, level, seed, minotaur_coords = unpack_header(header)
+        n = rows * cols
+        expected = header_size + n * (2 if flags & FLAG_ORDER else 1)
+        if os.fstat(file.fileno()).st_size < expected:
+            raise MazeFileError(f"Maze file is truncated, expected {expected} bytes")
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    cells = view[header_size:header_size + n]
+    order = view[header_size + n:header_size + 2 * n] if flags & FLAG_ORDER else None
+    view.release()
+    maze = GridMaze(rows, cols, cells, order)
+    return MazeFile(maze, level, seed, minotaur_coords, mapping)
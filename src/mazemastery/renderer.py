@@ -1,21 +1,30 @@
 import math
 import os
 import random
+import threading
 import tkinter as tk
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Tuple
 
 from PIL import Image, ImageTk  # type: ignore
 
 from mazemastery.debug_menu import DebugMenu
+from mazemastery.grid import GridMaze, are_connected
+from mazemastery.infinite import HashedMaze, MazeWindow
 from mazemastery.maze import get_maze_size
+from mazemastery.rng import resolve
 from mazemastery.styles import Colors
-from mazemastery.types import ColorDict, Coord
+from mazemastery.types import AnyMaze, ColorDict, Coord
+
+
+def cell_tag(pos: Coord) -> str:
+    """Canvas tag of the walls, shadows and grass drawn for a cell."""
+    return f"maze_{pos[0]}_{pos[1]}"
 
 
 class Renderer:
     def __init__(
         self,
-        maze: Dict[Tuple[int, int], List[Tuple[int, int]]],
+        maze: AnyMaze,
         minotaur_coords: Tuple[int, int],
         cell_size: int = 50,
         grid_width: int | None = None,
@@ -25,7 +34,9 @@ class Renderer:
         offset_rows: int = 2,
         offset_cols: int = 1,
         initial_pos: Tuple[int, int] = (0, 0),
-        initial_lives: int = 5
+        initial_lives: int = 5,
+        rng: random.Random | None = None,
+        decorations: bool = True,
     ):
         """
         A class for rendering a maze.
@@ -42,6 +53,9 @@ class Renderer:
                 top of the maze.
             offset_cols: Number of columns to offset the maze by to add space
                 on the left of the maze.
+            rng: Random number generator for the decorations (pebbles and
+                grass). Defaults to the one of the `random` module.
+            decorations: Whether to draw pebbles and grass at all.
         """
         self.maze = maze
         self.minotaur_coords = minotaur_coords
@@ -51,7 +65,13 @@ class Renderer:
         self.offset_cols = offset_cols
         self.delay = delay
         self.m, self.n = get_maze_size(maze)
+
+        # Maze coordinates of the top-left cell shown, for the row and column
+        # numbers (see `ViewportRenderer`).
+        self.origin: Coord = (0, 0)
         self.initial_lives = initial_lives
+        self.rng = resolve(rng)
+        self.decorations = decorations
 
         # Derived sizes
         self.wall_width = self.cell_size // 10
@@ -75,6 +95,13 @@ class Renderer:
         # all items on every update_draw call.
         self.blue_gem_buffer: set[Coord] = set()
         self.red_gem_buffer: set[Coord] = set()
+
+        # Cells whose walls changed (see `GridMaze.listeners`). Walls may
+        # change on the solution thread, so the buffer is guarded by a lock.
+        self.wall_buffer: set[Coord] = set()
+        self.wall_lock = threading.Lock()
+        if isinstance(maze, GridMaze):
+            maze.add_listener(self.push_wall_buffer)
         self.initial_pos = initial_pos
 
         # Canvas to draw on
@@ -87,9 +114,10 @@ class Renderer:
             height=(self.m + self.offset_rows + 1) * cell_size
         )
         self.debug_menu = DebugMenu(self)
-        self.canvas.grid(row=0, column=0, rowspan=len(self.debug_menu.api_buttons) + len(self.debug_menu.state_labels) + self.offset_rows + 2 + 2)
+        self.canvas.grid(row=0, column=0, rowspan=self.debug_menu.rows + self.offset_rows)
         self.canvas.configure(bg=Colors.brown_highlight)
         self.root.configure(bg=Colors.brown_highlight)
+        self.root.bind("<<WallsChanged>>", lambda event: self.draw_wall_buffer())
 
         # For sprites
         self.sprites: dict = {}
@@ -114,6 +142,7 @@ class Renderer:
         """
         # self.draw_path_segment(old_pos, curr_pos)
         self.draw_row_col_numbers(old_pos, curr_pos)
+        self.draw_wall_buffer()
         self.draw_gems()
         self.draw_player(old_pos, curr_pos)
         self.draw_hearts(num=self.initial_lives, filled=lives)
@@ -121,7 +150,24 @@ class Renderer:
         self.red_gem_buffer = set()
         self.blue_gem_buffer = set()
 
-    def draw_wall(self, start_x: int, start_y: int, end_x: int, end_y: int, wall_width: int, wall_color: str) -> None:
+    def draw_move(self, old_pos: Coord, curr_pos: Coord) -> None:
+        """
+        Draws the player and the row and column numbers after a move made
+        outside of the solution, i.e., with the buttons of the debug menu.
+        """
+        self.draw_row_col_numbers(old_pos, curr_pos)
+        self.draw_player(old_pos, curr_pos)
+
+    def draw_wall(
+        self,
+        start_x: int,
+        start_y: int,
+        end_x: int,
+        end_y: int,
+        wall_width: int,
+        wall_color: str,
+        tag: str | tuple[str, ...] = "wall",
+    ) -> None:
         self.canvas.create_line( # type: ignore
             start_x,
             start_y,
@@ -129,115 +175,129 @@ class Renderer:
             end_y,
             width=wall_width,
             fill=wall_color,
-            tag="wall",
+            tag=tag,
             capstyle=tk.ROUND,
         )
 
     def draw_walls(self, wall_width: int, wall_color: str) -> None:
         for i in range(self.m):
             for j in range(self.n):
-                off_i = i + self.offset_rows
-                off_j = j + self.offset_cols
-                if not (i - 1, j) in self.maze[(i, j)]:  # Northern neighbor missing
-                    self.draw_wall(
-                        start_x=off_j * self.cell_size,
-                        start_y=off_i * self.cell_size,
-                        end_x=(off_j + 1) * self.cell_size,
-                        end_y=off_i * self.cell_size,
-                        wall_width=wall_width,
-                        wall_color=wall_color,
-                    )
-                if not (i, j - 1) in self.maze[(i, j)]:  # Western neighbor missing
-                    self.draw_wall(
-                        start_x=off_j * self.cell_size,
-                        start_y=off_i * self.cell_size,
-                        end_x=off_j * self.cell_size,
-                        end_y=(off_i + 1) * self.cell_size,
-                        wall_width=wall_width,
-                        wall_color=wall_color,
-                    )
-                if not (i, j + 1) in self.maze[(i, j)]:  # Eastern neighbor missing
-                    self.draw_wall(
-                        start_x=(off_j + 1) * self.cell_size,
-                        start_y=off_i * self.cell_size,
-                        end_x=(off_j + 1) * self.cell_size,
-                        end_y=(off_i + 1) * self.cell_size,
-                        wall_width=wall_width,
-                        wall_color=wall_color,
-                    )
-                if not (i + 1, j) in self.maze[(i, j)]:  # Southern neighbor missing
-                    self.draw_wall(
-                        start_x=off_j * self.cell_size,
-                        start_y=(off_i + 1) * self.cell_size,
-                        end_x=(off_j + 1) * self.cell_size,
-                        end_y=(off_i + 1) * self.cell_size,
-                        wall_width=wall_width,
-                        wall_color=wall_color,
-                    )
+                self.draw_cell_walls((i, j), wall_width, wall_color)
+
+    def draw_cell_walls(self, pos: Coord, wall_width: int, wall_color: str) -> None:
+        i, j = pos
+        off_i = i + self.offset_rows
+        off_j = j + self.offset_cols
+        tag = ("wall", cell_tag(pos))
+        if not are_connected(self.maze, (i, j), (i - 1, j)):  # Northern neighbor missing
+            self.draw_wall(
+                start_x=off_j * self.cell_size,
+                start_y=off_i * self.cell_size,
+                end_x=(off_j + 1) * self.cell_size,
+                end_y=off_i * self.cell_size,
+                wall_width=wall_width,
+                wall_color=wall_color,
+                tag=tag,
+            )
+        if not are_connected(self.maze, (i, j), (i, j - 1)):  # Western neighbor missing
+            self.draw_wall(
+                start_x=off_j * self.cell_size,
+                start_y=off_i * self.cell_size,
+                end_x=off_j * self.cell_size,
+                end_y=(off_i + 1) * self.cell_size,
+                wall_width=wall_width,
+                wall_color=wall_color,
+                tag=tag,
+            )
+        if not are_connected(self.maze, (i, j), (i, j + 1)):  # Eastern neighbor missing
+            self.draw_wall(
+                start_x=(off_j + 1) * self.cell_size,
+                start_y=off_i * self.cell_size,
+                end_x=(off_j + 1) * self.cell_size,
+                end_y=(off_i + 1) * self.cell_size,
+                wall_width=wall_width,
+                wall_color=wall_color,
+                tag=tag,
+            )
+        if not are_connected(self.maze, (i, j), (i + 1, j)):  # Southern neighbor missing
+            self.draw_wall(
+                start_x=off_j * self.cell_size,
+                start_y=(off_i + 1) * self.cell_size,
+                end_x=(off_j + 1) * self.cell_size,
+                end_y=(off_i + 1) * self.cell_size,
+                wall_width=wall_width,
+                wall_color=wall_color,
+                tag=tag,
+            )
 
     def draw_wall_shadows(self) -> None:
         for i in range(self.m):
             for j in range(self.n):
-                off_i = i + self.offset_rows
-                off_j = j + self.offset_cols
-                if not (i - 1, j) in self.maze[(i, j)]:  # Horizontal shadow
-                    # If there is a wall to the left, we need to adjust
-                    # the shadow to the left because of the thickness of the
-                    # wall
-                    if (i, j - 1) not in self.maze[(i, j)]:
-                        left_x = off_j * self.cell_size
-                    else:
-                        left_x = off_j * self.cell_size - 2 * self.wall_width
-
-                    # If there is a wall to the right, we need to clip the shadow to avoid bleeding beyong the wall
-                    if (i, j + 1) not in self.maze[(i, j)]:
-                        right_x = (off_j + 1) * self.cell_size
-                    else:
-                        right_x = (off_j + 1) * self.cell_size + self.shadow_offset
-                    self.canvas.create_polygon( # type: ignore
-                        left_x,
-                        off_i * self.cell_size,
-                        (off_j + 1) * self.cell_size,
-                        off_i * self.cell_size
-                        - 2 * self.wall_width,  # compensating for wall-width
-                        right_x,
-                        off_i * self.cell_size,
-                        right_x,
-                        off_i * self.cell_size + self.shadow_offset,
-                        left_x + self.shadow_offset,
-                        off_i * self.cell_size + self.shadow_offset,
-                        fill=Colors.brown_border,
-                        tag="shadow",
-                    )
+                self.draw_cell_shadows((i, j))
 
-                if not (i, j - 1) in self.maze[(i, j)]:  # Vertical shadow
-                    # If there is no wall to the top, we need to adjust the
-                    # shadow to the top because of the tickness of the wall
-                    if (i - 1, j) not in self.maze[(i, j)]:
-                        top_y = off_i * self.cell_size
-                    else:
-                        top_y = off_i * self.cell_size - 2 * self.wall_width
-
-                    # If there is a wall below, we need to clip the shadow to
-                    # avoid bleeding beyong the wall
-                    if (i + 1, j) not in self.maze[(i, j)]:
-                        bottom_y = (off_i + 1) * self.cell_size
-                    else:
-                        bottom_y = (off_i + 1) * self.cell_size + self.shadow_offset
-                    self.canvas.create_polygon( # type: ignore
-                        off_j * self.cell_size,
-                        top_y,
-                        off_j * self.cell_size + self.shadow_offset,
-                        top_y + self.shadow_offset,
-                        off_j * self.cell_size + self.shadow_offset,
-                        bottom_y,
-                        off_j * self.cell_size,
-                        bottom_y,
-                        off_j * self.cell_size - 2 * self.wall_width,
-                        (off_i + 1) * self.cell_size,
-                        fill=Colors.brown_border,
-                        tag="shadow",
-                    )
+    def draw_cell_shadows(self, pos: Coord) -> None:
+        i, j = pos
+        off_i = i + self.offset_rows
+        off_j = j + self.offset_cols
+        tag = ("shadow", cell_tag(pos))
+        if not are_connected(self.maze, (i, j), (i - 1, j)):  # Horizontal shadow
+            # If there is a wall to the left, we need to adjust
+            # the shadow to the left because of the thickness of the
+            # wall
+            if not are_connected(self.maze, (i, j), (i, j - 1)):
+                left_x = off_j * self.cell_size
+            else:
+                left_x = off_j * self.cell_size - 2 * self.wall_width
+
+            # If there is a wall to the right, we need to clip the shadow to avoid bleeding beyong the wall
+            if not are_connected(self.maze, (i, j), (i, j + 1)):
+                right_x = (off_j + 1) * self.cell_size
+            else:
+                right_x = (off_j + 1) * self.cell_size + self.shadow_offset
+            self.canvas.create_polygon( # type: ignore
+                left_x,
+                off_i * self.cell_size,
+                (off_j + 1) * self.cell_size,
+                off_i * self.cell_size
+                - 2 * self.wall_width,  # compensating for wall-width
+                right_x,
+                off_i * self.cell_size,
+                right_x,
+                off_i * self.cell_size + self.shadow_offset,
+                left_x + self.shadow_offset,
+                off_i * self.cell_size + self.shadow_offset,
+                fill=Colors.brown_border,
+                tag=tag,
+            )
+
+        if not are_connected(self.maze, (i, j), (i, j - 1)):  # Vertical shadow
+            # If there is no wall to the top, we need to adjust the
+            # shadow to the top because of the tickness of the wall
+            if not are_connected(self.maze, (i, j), (i - 1, j)):
+                top_y = off_i * self.cell_size
+            else:
+                top_y = off_i * self.cell_size - 2 * self.wall_width
+
+            # If there is a wall below, we need to clip the shadow to
+            # avoid bleeding beyong the wall
+            if not are_connected(self.maze, (i, j), (i + 1, j)):
+                bottom_y = (off_i + 1) * self.cell_size
+            else:
+                bottom_y = (off_i + 1) * self.cell_size + self.shadow_offset
+            self.canvas.create_polygon( # type: ignore
+                off_j * self.cell_size,
+                top_y,
+                off_j * self.cell_size + self.shadow_offset,
+                top_y + self.shadow_offset,
+                off_j * self.cell_size + self.shadow_offset,
+                bottom_y,
+                off_j * self.cell_size,
+                bottom_y,
+                off_j * self.cell_size - 2 * self.wall_width,
+                (off_i + 1) * self.cell_size,
+                fill=Colors.brown_border,
+                tag=tag,
+            )
 
     def draw_grid(self) -> None:
 
@@ -265,7 +325,7 @@ class Renderer:
                 tag="grid",
             )
 
-    def draw_gem(self, pos: Coord, gem_size: int, color: ColorDict) -> None:
+    def draw_gem(self, pos: Coord, gem_size: int, color: ColorDict, tags: str = "gem") -> None:
         """
         Draws a fancy gem at in the cell (i, j).
         """
@@ -285,6 +345,7 @@ class Renderer:
             y[0] + self.gem_sixth,
             fill=Colors.brown_border,
             outline="",
+            tags=tags,
         )
 
         # Full gem
@@ -299,6 +360,7 @@ class Renderer:
             x[1], y[0],
             fill=color[0],
             width=2,
+            tags=tags,
         )
 
         # Middle
@@ -310,6 +372,7 @@ class Renderer:
             fill=color["main"],
             outline=color[1],
             width=2,
+            tags=tags,
         )
 
         # Shine
@@ -320,6 +383,7 @@ class Renderer:
             x[2], y[2],
             fill=color[3],
             outline="",
+            tags=tags,
         )
 
         # Color 1
@@ -331,6 +395,7 @@ class Renderer:
             fill=color[1],
             outline=color[0],
             width=2,
+            tags=tags,
         )
         self.canvas.create_polygon(
             x[2], y[1],
@@ -340,11 +405,13 @@ class Renderer:
             fill=color[1],
             outline=color[0],
             width=2,
+            tags=tags,
         )
 
         # Color 2
         self.canvas.create_polygon(
-            x[1], y[0], x[0], y[1], x[1], y[1], fill=color[2], outline=color[1]
+            x[1], y[0], x[0], y[1], x[1], y[1], fill=color[2], outline=color[1],
+            tags=tags,
         )
         self.canvas.create_polygon(
             x[2], y[2],
@@ -353,6 +420,7 @@ class Renderer:
             fill=color[2],
             outline=color[1],
             width=2,
+            tags=tags,
         )
 
         # Color 3
@@ -364,6 +432,7 @@ class Renderer:
             fill=color[3],
             outline=color[1],
             width=2,
+            tags=tags,
         )
 
         # Color 4
@@ -375,6 +444,7 @@ class Renderer:
             fill=color[3],
             outline=color[1],
             width=2,
+            tags=tags,
         )
         self.canvas.create_polygon(
             x[1], y[2],
@@ -384,6 +454,7 @@ class Renderer:
             fill=color[3],
             outline=color[0],
             width=2,
+            tags=tags,
         )
 
         # Color 5
@@ -394,6 +465,7 @@ class Renderer:
             fill=color[4],
             outline=color[1],
             width=2,
+            tags=tags,
         )
 
     def draw_grass_blades(self, pos: Coord, num_grass: int=3, num_blades: int=4) -> None:
@@ -413,10 +485,10 @@ class Renderer:
         # Generate positions before drawing to potentially change drawing order
         base_positions = []
         for _ in range(num_grass):
-            x = (j + self.offset_cols) * self.cell_size + random.randint(
+            x = (j + self.offset_cols) * self.cell_size + self.rng.randint(
                 0, self.cell_size - num_blades * 2 * blade_width
             )
-            y = (k + self.offset_rows) * self.cell_size + random.randint(
+            y = (k + self.offset_rows) * self.cell_size + self.rng.randint(
                 0, self.cell_size
             )
             base_positions.append((x, y))
@@ -426,7 +498,7 @@ class Renderer:
 
         for x, y in base_positions:
             for k in range(num_blades):
-                blade_height = random.randint(min_height, max_height)
+                blade_height = self.rng.randint(min_height, max_height)
                 blade_x = x + k * 2 * blade_width
 
                 # Shadow
@@ -463,7 +535,7 @@ class Renderer:
                     y - blade_height,
                     fill=Colors.grass_base,
                     outline="",
-                    tag="grass_blade",
+                    tag=("grass_blade", cell_tag(pos)),
                 )
 
                 # Small highlight
@@ -474,7 +546,7 @@ class Renderer:
                     y - blade_height,
                     fill=Colors.grass_top,
                     outline="",
-                    tag="grass_blade",
+                    tag=("grass_blade", cell_tag(pos)),
                 )
 
     def draw_grass(self) -> None:
@@ -484,24 +556,27 @@ class Renderer:
         """
         for i in range(self.m):
             for j in range(self.n):
-                if self.maze[(i, j)] != []:
-                    continue
-                off_i = i + self.offset_rows
-                off_j = j + self.offset_cols
-                self.canvas.create_rectangle( # type: ignore
-                    off_j * self.cell_size,
-                    off_i * self.cell_size,
-                    (off_j + 1) * self.cell_size,
-                    (off_i + 1) * self.cell_size,
-                    fill=Colors.green_base,
-                    outline="",
-                    tag="cell",
-                )
+                if self.maze[(i, j)] == []:
+                    self.draw_grass_cell((i, j))
         for i in range(self.m):
             for j in range(self.n):
-                if self.maze[(i, j)] == []:
+                if self.decorations and self.maze[(i, j)] == []:
                     self.draw_grass_blades((i, j))
 
+    def draw_grass_cell(self, pos: Coord) -> None:
+        i, j = pos
+        off_i = i + self.offset_rows
+        off_j = j + self.offset_cols
+        self.canvas.create_rectangle( # type: ignore
+            off_j * self.cell_size,
+            off_i * self.cell_size,
+            (off_j + 1) * self.cell_size,
+            (off_i + 1) * self.cell_size,
+            fill=Colors.green_base,
+            outline="",
+            tag=("cell", cell_tag(pos)),
+        )
+
     def draw_maze(self) -> None:
         """
         Render a maze using tkinter.
@@ -509,15 +584,85 @@ class Renderer:
         self.draw_cells(Colors.brown_base)
         self.draw_grid()
 
-        # Creating illusion of thick walls by overlaying multiple walls
-        self.draw_walls(self.wall_width * 4, Colors.brown_border)
-        self.draw_wall_shadows()
-        self.draw_walls(self.wall_width * 3, Colors.brown_base)
-        self.draw_walls(self.wall_width * 2, Colors.green_border)
-        self.draw_walls(self.wall_width, Colors.green_base)
+        # Creating illusion of thick walls by overlaying multiple walls. Each
+        # layer is followed by an invisible marker, such that walls can be
+        # redrawn into the right layer later on (see `redraw_cell`).
+        for layer, draw in enumerate(self.maze_layers()):
+            for i in range(self.m):
+                for j in range(self.n):
+                    draw((i, j))
+            self.draw_layer_end(layer)
 
         # Cover empty cells.
         self.draw_grass()
+        self.draw_layer_end(len(self.maze_layers()))
+
+    def maze_layers(self) -> list[Callable[[Coord], None]]:
+        """
+        Functions that draw the walls of a cell, one per layer from bottom
+        to top.
+        """
+        return [
+            lambda pos: self.draw_cell_walls(pos, self.wall_width * 4, Colors.brown_border),
+            self.draw_cell_shadows,
+            lambda pos: self.draw_cell_walls(pos, self.wall_width * 3, Colors.brown_base),
+            lambda pos: self.draw_cell_walls(pos, self.wall_width * 2, Colors.green_border),
+            lambda pos: self.draw_cell_walls(pos, self.wall_width, Colors.green_base),
+        ]
+
+    def draw_layer_end(self, layer: int) -> None:
+        self.canvas.create_line(0, 0, 0, 0, state=tk.HIDDEN, tag=f"layer_end_{layer}")
+
+    def redraw_cell(self, pos: Coord) -> None:
+        """
+        Redraws the walls, shadows and grass of a single cell after its walls
+        changed, keeping the order of the layers.
+        """
+        tag = cell_tag(pos)
+        self.canvas.delete(tag)
+        layers = self.maze_layers()
+        if self.maze[pos] == []:
+            layers.append(self.draw_grass_cell)
+            if self.decorations:
+                layers.append(self.draw_grass_blades)
+        for layer, draw in enumerate(layers):
+            before = set(self.canvas.find_withtag(tag))
+            draw(pos)
+            end = f"layer_end_{min(layer, len(self.maze_layers()))}"
+            for item in self.canvas.find_withtag(tag):
+                if item not in before:
+                    self.canvas.tag_lower(item, end)
+
+    def close(self) -> None:
+        """
+        Stops following wall changes of the maze. Called when the run ends,
+        since mazes can outlive their run (e.g., in a `MazeCache`).
+        """
+        if isinstance(self.maze, GridMaze):
+            self.maze.remove_listener(self.push_wall_buffer)
+
+    def push_wall_buffer(self, c0: Coord, c1: Coord, opened: bool) -> None:
+        """
+        Buffers the cells of a changed wall and has the Tk event loop redraw
+        them, such that the change shows up right away, not only on the next
+        move (e.g., while the solution is paused in debug mode).
+        """
+        with self.wall_lock:
+            scheduled = bool(self.wall_buffer)
+            self.wall_buffer.update((c0, c1))
+        if scheduled:
+            return
+        try:
+            self.root.event_generate("<<WallsChanged>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # The window was closed.
+            pass
+
+    def draw_wall_buffer(self) -> None:
+        with self.wall_lock:
+            cells, self.wall_buffer = self.wall_buffer, set()
+        for pos in cells:
+            self.redraw_cell(pos)
 
     def draw_player(self, prev_pos: Tuple[int, int], curr_pos : Tuple[int, int]) -> None:
         """
@@ -562,13 +707,13 @@ class Renderer:
 
     def draw_pebble(self, pos: Coord) -> None:
         i, j = pos
-        x = random.randint(j * self.cell_size, (j + 1) * self.cell_size)
-        y = random.randint(i * self.cell_size, (i + 1) * self.cell_size)
+        x = self.rng.randint(j * self.cell_size, (j + 1) * self.cell_size)
+        y = self.rng.randint(i * self.cell_size, (i + 1) * self.cell_size)
 
         # Draw pebble.
         max_size = self.cell_size // 8
         min_size = self.cell_size // 16
-        size = random.randint(min_size, max_size)
+        size = self.rng.randint(min_size, max_size)
 
         # Base
         self.canvas.create_rectangle( # type: ignore
@@ -610,6 +755,8 @@ class Renderer:
                     tag="cell",
                 )
                 # Draw random pebbles
+                if not self.decorations:
+                    continue
                 for _ in range(pebble_count):
                     self.draw_pebble((off_i, off_j))
 
@@ -618,10 +765,20 @@ class Renderer:
         Render gems using tkinter.
         """
         for i, j in self.blue_gem_buffer:
-            self.draw_gem((i, j), self.cell_size // 2, Colors.blues)
+            self.draw_gem((i, j), self.cell_size // 2, Colors.blues, "blue_gem")
 
         for i, j in self.red_gem_buffer:
-            self.draw_gem((i, j), self.cell_size // 2, Colors.reds)
+            self.draw_gem((i, j), self.cell_size // 2, Colors.reds, "red_gem")
+
+    def clear_gems(self, color: str) -> None:
+        """
+        Removes all gems of `color` ("blue" or "red") from the canvas.
+        """
+        self.canvas.delete(f"{color}_gem")
+        if color == "blue":
+            self.blue_gem_buffer = set()
+        else:
+            self.red_gem_buffer = set()
 
     def draw_minotaur(self) -> None:
         """
@@ -662,7 +819,7 @@ class Renderer:
             self.canvas.create_text( # type: ignore
                 (self.offset_cols - 0.5) * self.cell_size,
                 (i + self.offset_rows + 0.5) * self.cell_size,
-                text=str(i),
+                text=str(i + self.origin[0]),
                 font=f"Arial {font_size} {'bold' if self.initial_pos[0] == i else ''}",
                 fill=Colors.blues[1] if self.initial_pos[0] == i else "white",
                 anchor="e",
@@ -672,7 +829,7 @@ class Renderer:
             self.canvas.create_text( # type: ignore
                 (j + self.offset_cols + 0.5) * self.cell_size,
                 (self.offset_rows - 2 / 3) * self.cell_size,
-                text=str(j),
+                text=str(j + self.origin[1]),
                 font=f"Arial {font_size} {'bold' if self.initial_pos[1] == j else ''}",
                 fill=Colors.blues[1] if self.initial_pos[1] == j else "white",
                 anchor="n",
@@ -689,7 +846,7 @@ class Renderer:
             self.canvas.create_text( # type: ignore
                 (self.offset_cols - 0.5) * self.cell_size,
                 (old_pos[0] + self.offset_rows + 0.5) * self.cell_size,
-                text=str(old_pos[0]),
+                text=str(old_pos[0] + self.origin[0]),
                 font=f"Arial {font_size}",
                 fill="white",
                 anchor="e",
@@ -698,7 +855,7 @@ class Renderer:
             self.canvas.create_text( # type: ignore
                 (self.offset_cols - 0.5) * self.cell_size,
                 (pos[0] + self.offset_rows + 0.5) * self.cell_size,
-                text=str(pos[0]),
+                text=str(pos[0] + self.origin[0]),
                 font=f"Arial {font_size} bold",
                 fill=Colors.blues[1],
                 anchor="e",
@@ -710,7 +867,7 @@ class Renderer:
             self.canvas.create_text( # type: ignore
                 (old_pos[1] + self.offset_cols + 0.5) * self.cell_size,
                 (self.offset_rows - 2 / 3) * self.cell_size,
-                text=str(old_pos[1]),
+                text=str(old_pos[1] + self.origin[1]),
                 font=f"Arial {font_size}",
                 fill="white",
                 anchor="n",
@@ -719,7 +876,7 @@ class Renderer:
             self.canvas.create_text( # type: ignore
                 (pos[1] + self.offset_cols + 0.5) * self.cell_size,
                 (self.offset_rows - 2 / 3) * self.cell_size,
-                text=str(pos[1]),
+                text=str(pos[1] + self.origin[1]),
                 font=f"Arial {font_size} bold",
                 fill=Colors.blues[1],
                 anchor="n",
@@ -825,6 +982,10 @@ class Renderer:
             outline=""
         )
     
+    def log(self, message: str) -> None:
+        """Reports an event of the game, e.g., an invalid move, on the console."""
+        print(message)
+
     def draw_popup(self, text: str, color: str = "black") -> None:
         self.end_screen = tk.Label(
             text=text,
@@ -840,7 +1001,7 @@ class Renderer:
         self.end_screen.grid(
             row=0,
             column=0,
-            rowspan=len(self.debug_menu.api_buttons) + len(self.debug_menu.state_labels) + self.offset_rows + 2 + 2)
+            rowspan=self.debug_menu.rows + self.offset_rows)
     
     def draw_cloud(self, pos: Coord, cloud_color: str = Colors.cloud) -> None:
         """
@@ -989,3 +1150,86 @@ class Renderer:
 
     def push_red_gem_buffer(self, pos: Coord) -> None:
         self.red_gem_buffer.add(pos)
+
+
+class ViewportRenderer(Renderer):
+    """
+    Renders a `rows` x `cols` window of an unbounded maze (see
+    infinite.py). Positions passed in are maze coordinates; the window
+    follows the player and is redrawn whenever the player leaves it, so
+    only cells near the player are ever generated.
+    """
+
+    def __init__(
+        self,
+        maze: HashedMaze,
+        minotaur_coords: Coord,
+        rows: int = 10,
+        cols: int = 10,
+        **kwargs: Any,
+    ):
+        self.window = MazeWindow(maze, (0, 0), rows, cols)
+        self.global_minotaur_coords = minotaur_coords
+
+        # Gems in maze coordinates, to draw them again after moving the window.
+        self.blue_gems: set[Coord] = set()
+        self.red_gems: set[Coord] = set()
+        super().__init__(self.window, minotaur_coords, **kwargs)
+
+    def move_window(self, pos: Coord) -> None:
+        """
+        Centers the window on `pos` (in maze coordinates) and redraws it.
+        """
+        rows, cols = self.window.rows, self.window.cols
+        self.origin = (max(0, pos[0] - rows // 2), max(0, pos[1] - cols // 2))
+        self.window.origin = self.origin
+        self.minotaur_coords = self.window.to_local(self.global_minotaur_coords)
+        self.initial_pos = self.window.to_local(pos)
+        self.canvas.delete("all")
+        self.initial_draw()
+        self.blue_gem_buffer = {self.window.to_local(p) for p in self.blue_gems if self.window.to_local(p) in self.window}
+        self.red_gem_buffer = {self.window.to_local(p) for p in self.red_gems if self.window.to_local(p) in self.window}
+
+    def initial_draw(self) -> None:
+        self.minotaur_coords = self.window.to_local(self.global_minotaur_coords)
+        super().initial_draw()
+
+    def update_draw(self, old_pos: Coord, curr_pos: Coord, lives: int) -> None:
+        if self.window.to_local(curr_pos) not in self.window:
+            self.move_window(curr_pos)
+        old_pos, curr_pos = self.window.to_local(old_pos), self.window.to_local(curr_pos)
+        if old_pos not in self.window:
+            old_pos = curr_pos
+        super().update_draw(old_pos, curr_pos, lives)
+
+    def draw_move(self, old_pos: Coord, curr_pos: Coord) -> None:
+        if self.window.to_local(curr_pos) not in self.window:
+            self.move_window(curr_pos)
+        old_pos, curr_pos = self.window.to_local(old_pos), self.window.to_local(curr_pos)
+        if old_pos not in self.window:
+            old_pos = curr_pos
+        super().draw_move(old_pos, curr_pos)
+
+    def draw_minotaur(self) -> None:
+        # The minotaur is only drawn once the window reaches it.
+        self.canvas.delete("minotaur")
+        if self.minotaur_coords in self.window:
+            super().draw_minotaur()
+
+    def draw_cloud(self, pos: Coord, cloud_color: str = Colors.cloud) -> None:
+        super().draw_cloud(self.window.to_local(pos), cloud_color)
+
+    def push_blue_gem_buffer(self, pos: Coord) -> None:
+        self.blue_gems.add(pos)
+        super().push_blue_gem_buffer(self.window.to_local(pos))
+
+    def push_red_gem_buffer(self, pos: Coord) -> None:
+        self.red_gems.add(pos)
+        super().push_red_gem_buffer(self.window.to_local(pos))
+
+    def clear_gems(self, color: str) -> None:
+        if color == "blue":
+            self.blue_gems = set()
+        else:
+            self.red_gems = set()
+        super().clear_gems(color)
@@ -0,0 +1,80 @@
+"""
+Helpers for passing random number generators around explicitly.
+
+Generators and decorators take an optional `random.Random`. Without one,
+they fall back to the generator behind the `random` module, such that
+seeding with `random.seed` keeps working for existing callers.
+"""
+import random
+from typing import Any
+
+
+class ModuleRandom(random.Random):
+    """
+    Draws from the generator behind the functions of the `random` module,
+    through their public names. All other methods are built on `random` and
+    `getrandbits`, so, e.g., `choice` advances the same sequence as
+    `random.choice` and `random.seed` applies.
+    """
+
+    def __init__(self) -> None:
+        # Unlike `random.Random`, do not seed, which would reseed the module.
+        self.gauss_next = None
+
+    def random(self) -> float:
+        return random.random()
+
+    def getrandbits(self, k: int) -> int:
+        return random.getrandbits(k)
+
+    def seed(self, *args: Any, **kwargs: Any) -> None:
+        random.seed(*args, **kwargs)
+
+    def getstate(self) -> Any:
+        return random.getstate()
+
+    def setstate(self, state: Any) -> None:
+        random.setstate(state)
+
+
+MODULE_RANDOM = ModuleRandom()
+
+
+def resolve(rng: Any) -> random.Random:
+    """
+    Returns `rng` as a `random.Random`. None selects the generator of the
+    `random` module (see `ModuleRandom`). A NumPy `Generator` is accepted as well; it seeds a new
+    `random.Random`, such that the result still only depends on its state.
+    """
+    if rng is None:
+        return MODULE_RANDOM
+    if isinstance(rng, random.Random):
+        return rng
+    if hasattr(rng, "integers"):
+        return random.Random(int(rng.integers(2**63)))
+    raise TypeError(f"Not a random number generator: {rng!r}")
+
+
+def child_rng(seed: int | None, stream: str) -> random.Random:
+    """
+    Derives an independent generator named `stream` from `seed`. Streams with
+    different names do not influence each other, so, e.g., drawing the
+    decorations never changes the maze. Without a seed, the generator is
+    seeded from the operating system.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}/{stream}")
+
+
+def numpy_generator(rng: Any) -> Any:
+    """
+    Returns `rng` as a NumPy `Generator`. Other generators (and None, see
+    `resolve`) seed a new one, such that the result only depends on their
+    state.
+    """
+    import numpy as np
+
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(resolve(rng).getrandbits(128))
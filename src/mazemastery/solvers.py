@@ -0,0 +1,263 @@
+"""
+Reference solvers that run directly on the wall bits of a maze, without
+the rendering of the teaching API. Used to check that mazes are solvable
+and to compare the steps of a student's solution with the optimum.
+
+All solvers take the maze, a start and a goal cell, and return a
+`SolveResult`. They expect that cells only open towards cells inside the
+grid, as is the case for all generated and loaded mazes.
+"""
+import heapq
+import time
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from mazemastery.grid import E, N, S, W, GridMaze, as_grid
+from mazemastery.types import AnyMaze, Coord
+
+# Directions in clockwise order, used to turn left and right.
+_CLOCKWISE = (N, E, S, W)
+_BACK = {N: S, W: E, E: W, S: N}
+
+
+@dataclass
+class SolveResult:
+    # Cells from the start to the goal, including both. Empty if the goal
+    # cannot be reached.
+    path: list[Coord]
+    # Number of cells whose neighbors were examined.
+    expanded: int
+    seconds: float
+
+    @property
+    def found(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def steps(self) -> int | None:
+        """Number of moves along the path, None if no path was found."""
+        return len(self.path) - 1 if self.path else None
+
+
+def _deltas(maze: GridMaze) -> dict[int, int]:
+    return {N: -maze.cols, W: -1, E: 1, S: maze.cols}
+
+
+def _trace(maze: GridMaze, came_from: bytearray, k: int, start: int) -> list[int]:
+    """
+    Follows the directions in `came_from`, which point from every reached
+    cell to its predecessor, from `k` back to `start`.
+    """
+    deltas = _deltas(maze)
+    path = [k]
+    while k != start:
+        k += deltas[came_from[k]]
+        path.append(k)
+    path.reverse()
+    return path
+
+
+def _result(maze: GridMaze, path: list[int], expanded: int, start_time: float) -> SolveResult:
+    cols = maze.cols
+    return SolveResult(
+        [divmod(k, cols) for k in path],
+        expanded,
+        time.perf_counter() - start_time,
+    )
+
+
+def bfs(maze: AnyMaze, start: Coord, goal: Coord) -> SolveResult:
+    """
+    Breadth-first search. Finds a shortest path.
+    """
+    start_time = time.perf_counter()
+    grid = as_grid(maze)
+    cells = grid.cells
+    s, g = grid.index(start), grid.index(goal)
+    moves = [(d, delta, _BACK[d]) for d, delta in _deltas(grid).items()]
+
+    # Direction towards the predecessor of each reached cell.
+    came_from = bytearray(len(cells))
+    reached = bytearray(len(cells))
+    reached[s] = 1
+    frontier = [s]
+    expanded = 0
+    while frontier and not reached[g]:
+        layer = []
+        for k in frontier:
+            expanded += 1
+            bits = cells[k]
+            for d, delta, back in moves:
+                if bits & d and not reached[k + delta]:
+                    reached[k + delta] = 1
+                    came_from[k + delta] = back
+                    layer.append(k + delta)
+        frontier = layer
+    if not reached[g]:
+        return _result(grid, [], expanded, start_time)
+    return _result(grid, _trace(grid, came_from, g, s), expanded, start_time)
+
+
+def bidirectional_bfs(maze: AnyMaze, start: Coord, goal: Coord) -> SolveResult:
+    """
+    Breadth-first search from both ends, always growing the smaller
+    frontier by a whole layer. Finds a shortest path and usually expands
+    far fewer cells than `bfs`.
+    """
+    start_time = time.perf_counter()
+    grid = as_grid(maze)
+    cells = grid.cells
+    n = len(cells)
+    s, g = grid.index(start), grid.index(goal)
+    if s == g:
+        return _result(grid, [s], 0, start_time)
+    moves = [(d, delta, _BACK[d]) for d, delta in _deltas(grid).items()]
+
+    # Side 0 searches from the start, side 1 from the goal. `side` is 0 for
+    # unreached cells, and 1 or 2 for cells reached from the start or goal.
+    came_from = (bytearray(n), bytearray(n))
+    dist = (array("i", [0]) * n, array("i", [0]) * n)
+    side = bytearray(n)
+    side[s], side[g] = 1, 2
+    frontiers = ([s], [g])
+    expanded = 0
+    while frontiers[0] and frontiers[1]:
+        x = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = x + 1, 2 - x
+        dist_x, from_x = dist[x], came_from[x]
+        best = None
+        layer = []
+        for k in frontiers[x]:
+            expanded += 1
+            bits = cells[k]
+            for d, delta, back in moves:
+                if not bits & d:
+                    continue
+                kk = k + delta
+                if side[kk] == other:
+                    length = dist_x[k] + 1 + dist[1 - x][kk]
+                    if best is None or length < best[0]:
+                        best = (length, k, kk)
+                elif not side[kk]:
+                    side[kk] = mine
+                    dist_x[kk] = dist_x[k] + 1
+                    from_x[kk] = back
+                    layer.append(kk)
+        if best is not None:
+            _, k, kk = best
+            if x == 1:
+                k, kk = kk, k
+            head = _trace(grid, came_from[0], k, s)
+            tail = _trace(grid, came_from[1], kk, g)
+            return _result(grid, head + tail[::-1], expanded, start_time)
+        frontiers = (layer, frontiers[1]) if x == 0 else (frontiers[0], layer)
+    return _result(grid, [], expanded, start_time)
+
+
+def astar(maze: AnyMaze, start: Coord, goal: Coord) -> SolveResult:
+    """
+    A* search with the Manhattan distance to the goal as heuristic. Finds a
+    shortest path. Ties are broken towards the goal.
+    """
+    start_time = time.perf_counter()
+    grid = as_grid(maze)
+    cells = grid.cells
+    cols = grid.cols
+    n = len(cells)
+    s, g = grid.index(start), grid.index(goal)
+    gi, gj = goal
+    moves = [(d, delta, _BACK[d]) for d, delta in _deltas(grid).items()]
+
+    came_from = bytearray(n)
+    cost = array("i", [-1]) * n
+    closed = bytearray(n)
+    cost[s] = 0
+    h = abs(start[0] - gi) + abs(start[1] - gj)
+    queue = [(h, h, s)]
+    expanded = 0
+    while queue:
+        _, _, k = heapq.heappop(queue)
+        if closed[k]:
+            continue
+        if k == g:
+            return _result(grid, _trace(grid, came_from, g, s), expanded, start_time)
+        closed[k] = 1
+        expanded += 1
+        bits = cells[k]
+        c = cost[k] + 1
+        for d, delta, back in moves:
+            kk = k + delta
+            if bits & d and not closed[kk] and (cost[kk] < 0 or c < cost[kk]):
+                cost[kk] = c
+                came_from[kk] = back
+                i, j = divmod(kk, cols)
+                h = abs(i - gi) + abs(j - gj)
+                heapq.heappush(queue, (c + h, h, kk))
+    return _result(grid, [], expanded, start_time)
+
+
+def wall_follower(
+    maze: AnyMaze, start: Coord, goal: Coord, hand: str = "left"
+) -> SolveResult:
+    """
+    Walks with one hand on the wall, as a student without any memory would.
+    The path is the walk itself, including dead ends and backtracking. Gives
+    up when the walk comes back to a cell in a heading it already had, which
+    happens when the goal is not on a wall connected to the start.
+    """
+    if hand not in ("left", "right"):
+        raise ValueError(f"Invalid hand: {hand}")
+    start_time = time.perf_counter()
+    grid = as_grid(maze)
+    cells = grid.cells
+    s, g = grid.index(start), grid.index(goal)
+    deltas = _deltas(grid)
+    # Turns to try in order: towards the hand, straight, away, back.
+    turns = (-1, 0, 1, 2) if hand == "left" else (1, 0, -1, 2)
+
+    # Headings in which each cell has been entered.
+    seen = bytearray(len(cells))
+    k, heading = s, 1  # Index into _CLOCKWISE, east
+    walk = [s]
+    while k != g:
+        bits = cells[k]
+        if not bits:
+            return _result(grid, [], len(walk), start_time)
+        for turn in turns:
+            d = _CLOCKWISE[(heading + turn) % 4]
+            if bits & d:
+                heading = (heading + turn) % 4
+                break
+        k += deltas[d]
+        if seen[k] & d:
+            return _result(grid, [], len(walk), start_time)
+        seen[k] |= d
+        walk.append(k)
+    return _result(grid, walk, len(walk), start_time)
+
+
+def left_hand(maze: AnyMaze, start: Coord, goal: Coord) -> SolveResult:
+    return wall_follower(maze, start, goal, "left")
+
+
+def right_hand(maze: AnyMaze, start: Coord, goal: Coord) -> SolveResult:
+    return wall_follower(maze, start, goal, "right")
+
+
+SOLVERS: dict[str, Callable[[AnyMaze, Coord, Coord], SolveResult]] = {
+    "bfs": bfs,
+    "bidirectional": bidirectional_bfs,
+    "astar": astar,
+    "left_hand": left_hand,
+    "right_hand": right_hand,
+}
+
+
+def solve(maze: AnyMaze, start: Coord, goal: Coord, solver: str = "bfs") -> SolveResult:
+    """
+    Solves `maze` from `start` to `goal` with one of the `SOLVERS`.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Invalid solver: {solver}")
+    return SOLVERS[solver](maze, start, goal)
@@ -1,6 +1,9 @@
+from collections.abc import Iterable
 from typing import Any
 
-from mazemastery.types import Coord, Maze, Renderer
+from mazemastery.control import Controller
+from mazemastery.gems import GemLayer
+from mazemastery.types import AnyRenderer, Coord, PlayableMaze
 
 
 class State:
@@ -17,23 +20,24 @@ class State:
     _self = None
 
     # Type declarations where mypy can't figure it out on its own
-    __maze: Maze
-    __renderer: Renderer
+    __maze: PlayableMaze
+    __renderer: AnyRenderer
     __minotaur_coords: Coord
 
     def __new__(
         cls,
-        maze: Maze | None=None,
-        renderer: Renderer | None=None,
+        maze: PlayableMaze | None=None,
+        renderer: AnyRenderer | None=None,
         start_pos: Coord=(0, 0),
         minotaur_coords: Coord=(0, 0),
-        blue_gem_coords: list[Coord]=[],
-        red_gem_coords: list[Coord]=[],
+        blue_gem_coords: Iterable[Coord]=(),
+        red_gem_coords: Iterable[Coord]=(),
         stack: list[Coord]=[],
         found: bool=False,
         initial_lives: int=5,
         dead: bool=False,
         level: int=1,
+        max_moves: int | None=None,
         *args: Any,
         **kwargs: Any,
     ) -> "State":
@@ -45,40 +49,53 @@ class State:
             cls._self.__renderer = renderer
             cls._self.__pos = start_pos
             cls._self.__minotaur_coords = minotaur_coords
-            cls._self.__blue_gem_coords = blue_gem_coords
-            cls._self.__red_gem_coords = red_gem_coords
+            cls._self.__blue_gems = GemLayer(maze, blue_gem_coords)
+            cls._self.__red_gems = GemLayer(maze, red_gem_coords)
             cls._self.__stack = stack
             cls._self.__found = found
             cls._self.__initial_lives = initial_lives
             cls._self.__lives = initial_lives
             cls._self.__dead = dead
             cls._self.__level = level
+            cls._self.__moves = 0
+            cls._self.__moves_to_minotaur = None
+            cls._self.__max_moves = max_moves
+            cls._self.__controller = Controller()
         return cls._self
 
     def __init__(
         self,
-        maze: Maze | None=None,
-        renderer: Renderer | None=None,
+        maze: PlayableMaze | None=None,
+        renderer: AnyRenderer | None=None,
         start_pos: Coord=(0, 0),
         minotaur_coords: Coord=(0, 0),
-        blue_gem_coords: list[Coord]=[],
-        red_gem_coords: list[Coord]=[],
+        blue_gem_coords: Iterable[Coord]=(),
+        red_gem_coords: Iterable[Coord]=(),
         stack: list[Coord]=[],
         found: bool=False,
         initial_lives: int=5,
         dead: bool=False,
         level: int=1,
+        max_moves: int | None=None,
         *args: Any,
         **kwargs: Any,
     ):
         super().__init__(*args, **kwargs)
 
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Discards the current state, such that the next instantiation starts
+        a new game. Needed to run more than one game in the same process.
+        """
+        cls._self = None
+
     @property
-    def maze(self) -> Maze:
+    def maze(self) -> PlayableMaze:
         return self.__maze
 
     @property
-    def renderer(self) -> Renderer:
+    def renderer(self) -> AnyRenderer:
         return self.__renderer
 
     @property
@@ -94,20 +111,28 @@ class State:
         return self.__minotaur_coords
 
     @property
-    def blue_gem_coords(self) -> list[Coord]:
-        return self.__blue_gem_coords
+    def blue_gem_coords(self) -> GemLayer:
+        """
+        The cells with blue gems, in the order they were put. This is the
+        layer itself, not a copy, so `append` puts a gem (see `GemLayer`).
+        """
+        return self.__blue_gems
 
     @blue_gem_coords.setter
-    def blue_gem_coords(self, new: list[Coord]) -> None:
-        self.__blue_gem_coords = new
+    def blue_gem_coords(self, new: Iterable[Coord]) -> None:
+        self.__blue_gems = GemLayer(self.__maze, new)
 
     @property
-    def red_gem_coords(self) -> list[Coord]:
-        return self.__red_gem_coords
+    def red_gem_coords(self) -> GemLayer:
+        """
+        The cells with red gems, in the order they were put. This is the
+        layer itself, not a copy, so `append` puts a gem (see `GemLayer`).
+        """
+        return self.__red_gems
 
     @red_gem_coords.setter
-    def red_gem_coords(self, new: list[Coord]) -> None:
-        self.__red_gem_coords = new
+    def red_gem_coords(self, new: Iterable[Coord]) -> None:
+        self.__red_gems = GemLayer(self.__maze, new)
 
     @property
     def stack(self) -> list[Coord]:
@@ -156,3 +181,27 @@ class State:
     @level.setter
     def level(self, new: int) -> None:
         self.__level = new
+
+    @property
+    def moves(self) -> int:
+        return self.__moves
+
+    @moves.setter
+    def moves(self, new: int) -> None:
+        self.__moves = new
+
+    @property
+    def moves_to_minotaur(self) -> int | None:
+        return self.__moves_to_minotaur
+
+    @moves_to_minotaur.setter
+    def moves_to_minotaur(self, new: int | None) -> None:
+        self.__moves_to_minotaur = new
+
+    @property
+    def max_moves(self) -> int | None:
+        return self.__max_moves
+
+    @property
+    def controller(self) -> Controller:
+        return self.__controller
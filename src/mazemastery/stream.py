@@ -0,0 +1,244 @@
+"""
+Streaming maze generation for mazes that are too large to keep in memory.
+
+Rows are produced one at a time as bytearrays of wall bits (see grid.py),
+which is the same layout as a single row of `GridMaze.cells`. A row is
+complete when it is yielded, i.e., its southern openings are already
+decided. Rows can be handed to any number of sinks, which are callables
+taking the row number and the row.
+"""
+import random
+from collections.abc import Callable, Iterable, Iterator
+from typing import BinaryIO
+
+from mazemastery.grid import E, N, S, W, GridMaze
+from mazemastery.rng import resolve
+
+RowSink = Callable[[int, bytearray], None]
+
+
+def eller_rows(
+    rows: int,
+    cols: int,
+    p_join: float = 0.5,
+    p_down: float = 0.5,
+    rng: random.Random | None = None,
+) -> Iterator[bytearray]:
+    """
+    Generates a perfect maze row by row using Eller's algorithm. Only the
+    set membership of the current row is kept, so the working memory is
+    O(cols) regardless of the number of rows.
+
+    Args:
+        rows: Number of rows of the maze.
+        cols: Number of columns of the maze.
+        p_join: Probability of joining two horizontally adjacent cells that
+            are not connected yet.
+        p_down: Probability of a cell to be connected to the cell below.
+            Every set is connected downwards at least once.
+        rng: Random number generator to use. Defaults to the one of the
+            `random` module.
+    """
+    rng = resolve(rng)
+    rand = rng.random
+    choice = rng.choice
+    if rows <= 0 or cols <= 0:
+        raise ValueError(f"Invalid maze size: {rows}x{cols}")
+
+    # Label of the set each cell of the current row belongs to.
+    labels = list(range(cols))
+    next_label = cols
+    north = bytearray(cols)
+    for i in range(rows):
+        last = i == rows - 1
+        row = bytearray(north)
+
+        # Cells of the current row belonging to the same set point to the
+        # leftmost such cell, so that joining sets is a union in O(1)
+        # instead of relabeling the row.
+        first: dict[int, int] = {}
+        parent = [first.setdefault(label, j) for j, label in enumerate(labels)]
+        for j in range(cols - 1):
+            a = j
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            b = j + 1
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b or not (last or rand() < p_join):
+                continue
+            parent[max(a, b)] = min(a, b)
+            row[j] |= E
+            row[j + 1] |= W
+
+        north = bytearray(cols)
+        if not last:
+            members: dict[int, list[int]] = {}
+            for j in range(cols):
+                a = j
+                while parent[a] != a:
+                    a = parent[a]
+                members.setdefault(a, []).append(j)
+            for root, cells in members.items():
+                down = [j for j in cells if rand() < p_down]
+                if not down:
+                    down = [choice(cells)]
+                for j in down:
+                    row[j] |= S
+                    north[j] = N
+            below = []
+            for j in range(cols):
+                if north[j]:
+                    a = j
+                    while parent[a] != a:
+                        a = parent[a]
+                    below.append(labels[a])
+                else:
+                    below.append(next_label)
+                    next_label += 1
+            labels = below
+        yield row
+
+
+def stream_to(rows: Iterable[bytearray], *sinks: RowSink) -> int:
+    """
+    Passes every row to each of the sinks. Returns the number of rows.
+    """
+    count = 0
+    for i, row in enumerate(rows):
+        for sink in sinks:
+            sink(i, row)
+        count += 1
+    return count
+
+
+class FileSink:
+    """
+    Writes rows to a binary file, one byte per cell in row-major order. This
+    is the layout of `GridMaze.cells`.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+
+    def __call__(self, i: int, row: bytearray) -> None:
+        self.file.write(row)
+
+
+class GridSink:
+    """
+    Collects rows into a `GridMaze`. Only useful for mazes that fit into
+    memory, e.g., to render or solve a streamed maze.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.maze = GridMaze(rows, cols)
+
+    def __call__(self, i: int, row: bytearray) -> None:
+        cols = self.maze.cols
+        self.maze.cells[i * cols:(i + 1) * cols] = row
+
+
+class RowChecker:
+    """
+    Checks a maze while it is being streamed, keeping only O(cols) state.
+
+    Verifies that walls are consistent between adjacent cells, that no cell
+    opens to the outside of the grid, and that all cells are connected.
+    Counts the number of loops (zero for a perfect maze). Call `finish`
+    after the last row.
+    """
+
+    max_errors = 100
+
+    def __init__(self, cols: int):
+        self.cols = cols
+        self.rows = 0
+        self.edges = 0
+        self.errors: list[str] = []
+        self.prev: bytearray | None = None
+
+        # Component label of each cell of the previous row.
+        self.labels: list[int] = []
+        self.next_label = 0
+
+    def __call__(self, i: int, row: bytearray) -> None:
+        cols = self.cols
+        if len(row) != cols:
+            self.error(f"Row {i} has {len(row)} cells, expected {cols}")
+            return
+        if row[0] & W or row[-1] & E:
+            self.error(f"Row {i} opens to the outside of the grid")
+        for j in range(cols - 1):
+            if bool(row[j] & E) != bool(row[j + 1] & W):
+                self.error(f"Asymmetric wall between {(i, j)} and {(i, j + 1)}")
+        prev = self.prev
+        for j in range(cols):
+            above = prev is not None and bool(prev[j] & S)
+            if bool(row[j] & N) != above:
+                self.error(f"Asymmetric wall between {(i - 1, j)} and {(i, j)}")
+
+        # Union-find over the labels of the previous row and the fresh labels
+        # of cells that are not connected to the previous row.
+        parent: dict[int, int] = {}
+
+        def find(a: int) -> int:
+            while parent.setdefault(a, a) != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        labels = []
+        for j in range(cols):
+            if row[j] & N and prev is not None:
+                labels.append(self.labels[j])
+                self.edges += 1
+            else:
+                labels.append(self.next_label)
+                self.next_label += 1
+        for j in range(cols - 1):
+            if row[j] & E:
+                self.edges += 1
+                a, b = find(labels[j]), find(labels[j + 1])
+                if a != b:
+                    parent[a] = b
+        labels = [find(label) for label in labels]
+
+        # A component of the previous row that does not continue into this
+        # row is closed off from the rest of the maze.
+        if prev is not None:
+            continued = {find(label) for label in labels}
+            closed = {
+                find(label)
+                for j, label in enumerate(self.labels)
+                if not prev[j] & S
+            } - continued
+            if closed:
+                self.error(f"Row {i - 1} contains cells disconnected from the rest")
+
+        self.labels = labels
+        self.prev = row
+        self.rows += 1
+
+    def error(self, message: str) -> None:
+        # Keep the memory bounded even if every row is broken.
+        if len(self.errors) < self.max_errors:
+            self.errors.append(message)
+
+    def finish(self) -> bool:
+        """
+        Returns whether the maze is valid. Problems are listed in `errors`.
+        """
+        if self.prev is not None:
+            if any(c & S for c in self.prev):
+                self.error(f"Row {self.rows - 1} opens to the outside of the grid")
+            if len(set(self.labels)) > 1:
+                self.error(f"Row {self.rows - 1} contains cells disconnected from the rest")
+        return not self.errors
+
+    @property
+    def loops(self) -> int:
+        """Number of independent loops, i.e., edges - cells + 1."""
+        return self.edges - self.rows * self.cols + 1
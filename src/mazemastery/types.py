@@ -7,6 +7,21 @@ ColorDict = dict[int | Literal["main"], str]
 # This avoid circular imports.
 # See https://docs.python.org/3/library/typing.html#typing.TYPE_CHECKING
 if TYPE_CHECKING:
+    from mazemastery.grid import GridMaze as GridMaze
+    from mazemastery.infinite import HashedMaze as HashedMaze
+    from mazemastery.headless import NullRenderer as NullRenderer
     from mazemastery.renderer import Renderer as Renderer
 else:
+    GridMaze = object
+    HashedMaze = object
+    NullRenderer = object
     Renderer = object
+
+# Any maze that can be read like a dict-based maze.
+AnyMaze = Maze | GridMaze
+
+# Any maze a solution can be run on.
+PlayableMaze = AnyMaze | HashedMaze
+
+# Any renderer the API can draw to.
+AnyRenderer = Renderer | NullRenderer
@@ -0,0 +1,133 @@
+"""
+Structural checks for generated and loaded mazes.
+
+All checks but connectivity run on byte strings and big integers derived
+from `GridMaze.cells`, so they run at C speed. Connectivity reuses the
+distance field of the target (see distance.py), which is kept with the maze
+for later hints and grading.
+"""
+import os
+from itertools import compress
+
+from mazemastery.distance import distance_field
+from mazemastery.grid import E, N, S, W, GridMaze, as_grid
+from mazemastery.types import AnyMaze, Coord
+
+# Maps the wall bits of a cell to 1 if the given side is open.
+_SIDE = {d: bytes(1 if bits & d else 0 for bits in range(256)) for d in (N, W, E, S)}
+_INVALID = bytes(1 if bits > 15 else 0 for bits in range(256))
+
+
+class MazeValidationError(ValueError):
+    def __init__(self, errors: list[str]):
+        super().__init__("Invalid maze:\n" + "\n".join(errors))
+        self.errors = errors
+
+
+def _first(flags: bytes | bytearray) -> int:
+    """Index of the first non-zero byte."""
+    return len(flags) - len(flags.lstrip(b"\0"))
+
+
+def _validate_dict(maze: dict) -> list[str]:
+    errors = []
+    for cell, neighbors in maze.items():
+        if len(set(neighbors)) != len(neighbors):
+            errors.append(f"{cell} lists a neighbor more than once")
+        for neighbor in neighbors:
+            if neighbor not in maze:
+                errors.append(f"Neighbor {neighbor} of {cell} is not in the maze")
+            elif abs(neighbor[0] - cell[0]) + abs(neighbor[1] - cell[1]) != 1:
+                errors.append(f"{neighbor} is listed as neighbor of {cell} but is not adjacent")
+            elif cell not in maze[neighbor]:
+                errors.append(f"{neighbor} is a neighbor of {cell} but not vice versa")
+    return errors
+
+
+def validate(
+    maze: AnyMaze,
+    start: Coord = (0, 0),
+    target: Coord | None = None,
+    holes: bool = True,
+) -> list[str]:
+    """
+    Checks that
+    - neighbors are symmetric, adjacent and listed at most once,
+    - no cell opens to the outside of the grid,
+    - every cell with an opening can be reached from `start`,
+    - `target` (e.g., the minotaur) can be reached from `start`,
+    - no 2x2 block of cells is open (unless `holes` is False).
+    Returns a list of problems, which is empty for a valid maze.
+    """
+    if not isinstance(maze, GridMaze):
+        errors = _validate_dict(maze)
+        if errors:
+            return errors
+    grid = as_grid(maze)
+    rows, cols = grid.rows, grid.cols
+    cells = bytes(grid.cells)
+    n = rows * cols
+    errors = []
+
+    if cells.translate(_INVALID).strip(b"\0"):
+        k = _first(cells.translate(_INVALID))
+        errors.append(f"{grid.coord(k)} has invalid wall bits {cells[k]}")
+
+    north, west, east, south = (cells.translate(_SIDE[d]) for d in (N, W, E, S))
+    outside = [
+        ("north", north[:cols], lambda k: (0, k)),
+        ("south", south[n - cols:], lambda k: (rows - 1, k)),
+        ("west", west[::cols], lambda k: (k, 0)),
+        ("east", east[cols - 1::cols], lambda k: (k, cols - 1)),
+    ]
+    for side, flags, coord in outside:
+        if flags.strip(b"\0"):
+            errors.append(f"{coord(_first(flags))} opens to the outside on the {side}")
+
+    # Cells k and k + 1 (k + cols) share a wall. Pairs across the end of a
+    # row are both closed if the check above passed.
+    for a, b, step in ((east, west, 1), (south, north, cols)):
+        if a[:n - step] != b[step:]:
+            k = next(k for k in range(n - step) if a[k] != b[k + step])
+            errors.append(f"Asymmetric wall between {grid.coord(k)} and {grid.coord(k + step)}")
+    if errors:
+        return errors
+
+    if holes and rows > 1 and cols > 1:
+        # Bit 8k of these integers is set if side of cell k is open.
+        e = int.from_bytes(east, "little")
+        s = int.from_bytes(south, "little")
+        hole = e & s & (s >> 8) & (e >> (8 * cols))
+        if hole:
+            k = (hole & -hole).bit_length() // 8
+            errors.append(f"Open 2x2 block with north-west corner {grid.coord(k)}")
+
+    field = distance_field(grid, target if target is not None else start)
+    if field.distance(start) is None:
+        errors.append(f"The target {target} cannot be reached from {start}")
+    elif any(d < 0 for d in compress(field.dist, cells)):
+        k = next(k for k in range(n) if cells[k] and field.dist[k] < 0)
+        errors.append(f"{grid.coord(k)} cannot be reached from {start}")
+    return errors
+
+
+def check_maze(
+    maze: AnyMaze,
+    start: Coord = (0, 0),
+    target: Coord | None = None,
+    holes: bool = True,
+) -> None:
+    """
+    Raises a `MazeValidationError` if `validate` finds any problems.
+    """
+    errors = validate(maze, start, target, holes)
+    if errors:
+        raise MazeValidationError(errors)
+
+
+def validation_enabled() -> bool:
+    """
+    Whether `maze_factory` checks every maze it creates, which is enabled by
+    setting the environment variable MAZEMASTERY_VALIDATE.
+    """
+    return bool(os.environ.get("MAZEMASTERY_VALIDATE"))
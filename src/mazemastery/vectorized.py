@@ -0,0 +1,132 @@
+"""
+Maze generation with whole-array NumPy operations, for grids that are too
+large for the cell-by-cell engines in maze.py (e.g., 10,000x10,000).
+
+The arrays are views on `GridMaze.cells`, so no copy of the maze is made.
+Work is done in blocks of rows to bound the memory of temporaries.
+Requires NumPy (`pip install mazemastery[stats]`).
+"""
+import random
+
+import numpy as np
+
+from mazemastery.grid import E, N, S, W, GridMaze
+from mazemastery.rng import numpy_generator
+
+# Approximate number of cells processed at once.
+BLOCK_CELLS = 1 << 22
+
+
+def _grid_view(maze: GridMaze) -> np.ndarray:
+    return np.frombuffer(maze.cells, dtype=np.uint8).reshape(maze.rows, maze.cols)
+
+
+def sidewinder(rows: int, cols: int, rng: random.Random | np.random.Generator | None = None) -> GridMaze:
+    """
+    Creates a perfect maze with the sidewinder algorithm. Every row is split
+    into runs of cells connected from west to east, and a random cell of
+    each run is connected to the row above. The top row is a single run.
+    Rows are independent, so a whole block of rows is carved at once.
+    """
+    gen = numpy_generator(rng)
+    maze = GridMaze(rows, cols)
+    grid = _grid_view(maze)
+    flat = grid.reshape(-1)
+    block_rows = max(1, BLOCK_CELLS // cols)
+    for r0 in range(0, rows, block_rows):
+        block = grid[r0:r0 + block_rows]
+        nr = block.shape[0]
+        east = gen.random((nr, cols - 1), dtype=np.float32) < 0.5
+        if r0 == 0:
+            east[0] = True
+        block[:, :-1] |= east * np.uint8(E)
+        block[:, 1:] |= east * np.uint8(W)
+
+        # Runs start at the first column and after every closed east wall.
+        # In row-major order, every run is a contiguous range of cells.
+        is_start = np.ones((nr, cols), dtype=bool)
+        is_start[:, 1:] = ~east
+        starts = np.flatnonzero(is_start)
+        lengths = np.diff(starts, append=nr * cols)
+        up = starts + (gen.random(len(starts)) * lengths).astype(np.int64)
+        up += r0 * cols
+        up = up[up >= cols]
+        flat[up] |= N
+        flat[up - cols] |= S
+    return maze
+
+
+def _remove_phase(
+    grid: np.ndarray,
+    p_wall: np.ndarray,
+    first: int,
+    fwd: int,
+    back: int,
+    side: int,
+    gen: np.random.Generator,
+) -> None:
+    """
+    Removes the closed `fwd` walls of every second row of `grid`, starting
+    at row `first`, each with the probability in `p_wall` for its column,
+    unless this would complete a 2x2 block of open cells.
+
+    The 2x2 blocks above and below a wall consist of the wall itself, the
+    `fwd` walls of the adjacent row and two `side` walls. None of them are
+    changed in this phase, so all walls of the phase can be checked at once.
+    """
+    rows = grid.shape[0]
+    n = len(range(first, rows - 1, 2))
+    block_rows = max(1, BLOCK_CELLS // (2 * grid.shape[1]))
+    for b0 in range(0, n, block_rows):
+        b1 = min(n, b0 + block_rows)
+        lo, hi = first + 2 * b0, first + 2 * b1
+        row = grid[lo:hi:2]
+        above = grid[lo - 1:hi - 1:2]
+        below = grid[lo + 1:hi + 1:2]
+        remove = (row[:, :-1] & fwd) == 0
+        remove &= gen.random(remove.shape, dtype=np.float32) < p_wall
+        # A block is completed if its three other walls are open.
+        remove &= ~(
+            ((above[:, :-1] & fwd) != 0)
+            & ((above[:, :-1] & side) != 0)
+            & ((above[:, 1:] & side) != 0)
+        )
+        remove &= ~(
+            ((row[:, :-1] & side) != 0)
+            & ((row[:, 1:] & side) != 0)
+            & ((below[:, :-1] & fwd) != 0)
+        )
+        row[:, :-1] |= remove * np.uint8(fwd)
+        row[:, 1:] |= remove * np.uint8(back)
+
+
+def remove_walls_vectorized(
+    maze: GridMaze, p_remove: float, rng: random.Random | np.random.Generator | None = None
+) -> None:
+    """
+    Vectorized variant of `maze.remove_walls`. Each wall is removed with the
+    same probability as there: walls are considered once from each adjacent
+    inner cell, so a wall between two inner cells is removed with
+    probability 1 - (1 - p_remove)**2. Walls are processed in four phases
+    (east walls of odd and even rows, south walls of odd and even columns),
+    such that no two walls of a phase share a 2x2 block.
+    """
+    rows, cols = maze.rows, maze.cols
+    if p_remove <= 0 or rows < 3 or cols < 3:
+        return
+    gen = numpy_generator(rng)
+    grid = _grid_view(maze)
+
+    def p_wall(n: int) -> np.ndarray:
+        # Probability for the walls between cells k and k + 1 of a line of
+        # n cells, of which the first and last are on the border.
+        inner = np.zeros(n, dtype=np.int8)
+        inner[1:-1] = 1
+        sides = inner[:-1] + inner[1:]
+        return (1 - (1 - p_remove) ** sides).astype(np.float32)
+
+    # Walls of border rows (columns) are not considered along the border.
+    for first in (1, 2):
+        _remove_phase(grid, p_wall(cols), first, E, W, S, gen)
+    for first in (1, 2):
+        _remove_phase(grid.T, p_wall(rows), first, S, N, E, gen)